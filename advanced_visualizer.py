@@ -3,53 +3,277 @@ Advanced Visualization Module for Level 2 & 3 Implementation
 Creates interactive charts and dashboards using Plotly
 """
 
+import functools
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import types
 import plotly.graph_objects as go
-import plotly.express as px
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional
 import streamlit as st
 
+try:
+    from plotly_resampler import FigureResampler
+    PLOTLY_RESAMPLER_AVAILABLE = True
+except ImportError:
+    PLOTLY_RESAMPLER_AVAILABLE = False
+
+# Serialize figures with orjson (C extension, native numpy support) when installed
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = "orjson"
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _frame_digest(df: pd.DataFrame):
+    """Cache key for a price frame: shape, date span and a hash of every row, so re-adjusted history misses"""
+    if df.empty:
+        return df.shape
+    rows = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    return (df.shape, df.index[0], df.index[-1], hashlib.blake2b(rows.tobytes(), digest_size=16).digest())
+
+
+@st.cache_data(show_spinner=False, max_entries=32, hash_funcs={pd.DataFrame: _frame_digest})
+def _build_cached_figure(_builder, name: str, *args):
+    """Shared figure cache; `name` keeps entries of different chart methods apart"""
+    return _builder(*args)
+
+
+def _memoized_figure(method):
+    """Cache a figure-building method across Streamlit reruns"""
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        return _build_cached_figure(functools.partial(method, self), method.__qualname__, *args)
+    return wrapper
+
+
+# Above this many points figures are handed to plotly-resampler (when installed),
+# which ships only the visible, aggregated points to the browser
+RESAMPLE_MIN_POINTS = 10_000
+
+# Shared generator for placeholder sentiment scores
+_RNG = np.random.default_rng()
+
+# Above this many points line traces switch from SVG to WebGL rendering
+SCATTERGL_MIN_POINTS = 1000
+
+
+def _line_trace_type(n_points: int):
+    """Pick go.Scattergl for long series and go.Scatter for short ones"""
+    return go.Scattergl if n_points > SCATTERGL_MIN_POINTS else go.Scatter
+
+
+# Window reductions that need the full strided window (mean uses a cumulative sum instead)
+_STRIDED_REDUCERS = {
+    'std': lambda view: view.std(axis=1, ddof=1),
+    'min': lambda view: view.min(axis=1),
+    'max': lambda view: view.max(axis=1),
+}
+
+
+def _rolling_stats(values, windows, stats=('mean',)) -> Dict[str, np.ndarray]:
+    """Rolling statistics for several windows in one call.
+    
+    Returns {stat: array of shape (len(windows), len(values))}; the first window-1
+    entries of each row are NaN, matching pandas rolling(window). Supported stats:
+    'mean', 'std' (ddof=1), 'min' and 'max'.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    results = {stat: np.full((len(windows), n), np.nan) for stat in stats}
+    strided = [stat for stat in stats if stat != 'mean']
+    csum = np.concatenate(([0.0], np.cumsum(values))) if 'mean' in stats else None
+    
+    for row, window in enumerate(windows):
+        if n < window:
+            continue
+        if csum is not None:
+            results['mean'][row, window - 1:] = (csum[window:] - csum[:-window]) / window
+        if strided:
+            view = np.lib.stride_tricks.sliding_window_view(values, window)
+            for stat in strided:
+                results[stat][row, window - 1:] = _STRIDED_REDUCERS[stat](view)
+    
+    return results
+
+
+def _maybe_resample(fig: go.Figure, n_points: int) -> go.Figure:
+    """Wrap figures with very long series in a FigureResampler"""
+    if PLOTLY_RESAMPLER_AVAILABLE and n_points > RESAMPLE_MIN_POINTS:
+        return FigureResampler(fig)
+    return fig
+
+
+def _compact_prices(hist: pd.DataFrame) -> pd.DataFrame:
+    """Copy of a price frame with OHLC downcast to float32 to halve the serialized payload"""
+    return hist.astype({column: np.float32 for column in ('Open', 'High', 'Low', 'Close') if column in hist.columns})
+
+
+def _f32(values) -> np.ndarray:
+    """float32 copy of numeric trace data; halves the bytes Plotly serializes"""
+    return np.asarray(values, dtype=np.float32)
+
+
+def _volume_array(volume) -> np.ndarray:
+    """Volume as uint32 when every value fits, float32 otherwise"""
+    volume = np.nan_to_num(np.asarray(volume, dtype=np.float64))
+    if volume.size and volume.min() >= 0 and volume.max() <= np.iinfo(np.uint32).max:
+        return volume.astype(np.uint32)
+    return volume.astype(np.float32)
+
+
+def _clean_numeric_dict(values: Dict):
+    """Split a ratio dict into title-cased labels and a float array of its numeric entries"""
+    items = [(key.replace('_', ' ').title(), value) for key, value in values.items()
+             if value is not None and isinstance(value, (int, float))]
+    if not items:
+        return [], np.array([], dtype=np.float64)
+    names, numbers = zip(*items)
+    return list(names), np.asarray(numbers, dtype=np.float64)
+
+
+def _as_percentages(values: np.ndarray) -> np.ndarray:
+    """Scale fractional ratios (< 1) to percentages, leave the rest untouched"""
+    return np.where(values < 1, values * 100, values)
+
+
+def _rolling_annualized_volatility(close, window: int = 30, periods_per_year: int = 252) -> np.ndarray:
+    """Annualized rolling std (ddof=1) of daily returns, aligned with close[1:]"""
+    close = np.asarray(close, dtype=np.float64)
+    returns = close[1:] / close[:-1] - 1.0
+    return _rolling_stats(returns, (window,), ('std',))['std'][0] * np.sqrt(periods_per_year)
+
+
+@functools.lru_cache(maxsize=1)
+def _dashboard_skeleton() -> go.Figure:
+    """Empty 3x2 financial dashboard grid; callers copy it with go.Figure(...)"""
+    return make_subplots(
+        rows=3, cols=2,
+        subplot_titles=(
+            'Stock Price Trend (1 Year)', 'Volume Analysis',
+            'Financial Ratios Overview', 'Profitability Metrics',
+            'Price vs Moving Averages', 'Volatility Analysis'
+        ),
+        specs=[
+            [{"secondary_y": True}, {"secondary_y": False}],
+            [{"type": "bar"}, {"type": "bar"}],
+            [{"secondary_y": True}, {"type": "scatter"}]
+        ]
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _sentiment_skeleton() -> go.Figure:
+    """Empty 2x2 sentiment dashboard grid; callers copy it with go.Figure(...)"""
+    return make_subplots(
+        rows=2, cols=2,
+        subplot_titles=(
+            'Sentiment Distribution (VADER)', 'Sentiment Over Time',
+            'News Source Breakdown', 'Sentiment Confidence'
+        ),
+        specs=[
+            [{"type": "pie"}, {"type": "scatter"}],
+            [{"type": "bar"}, {"type": "bar"}]
+        ]
+    )
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def _fetch_history(ticker: str, period: str = "1y") -> pd.DataFrame:
+    """Fetch price history, cached for 15 minutes per (ticker, period)"""
+    import yfinance as yf
+    return yf.Ticker(ticker).history(period=period)
+
+
 class AdvancedVisualizer:
-    def __init__(self):
-        self.color_palette = {
-            'primary': '#1f77b4',
-            'secondary': '#ff7f0e',
-            'success': '#2ca02c',
-            'danger': '#d62728',
-            'warning': '#ff9800',
-            'info': '#17a2b8',
-            'light': '#f8f9fa',
-            'dark': '#343a40'
-        }
+    _COLOR_PALETTE = types.MappingProxyType({
+        'primary': '#1f77b4',
+        'secondary': '#ff7f0e',
+        'success': '#2ca02c',
+        'danger': '#d62728',
+        'warning': '#ff9800',
+        'info': '#17a2b8',
+        'light': '#f8f9fa',
+        'dark': '#343a40'
+    })
+    
+    # Risk lookup tables: (ratio key, ascending thresholds, score per bucket, searchsorted side).
+    # side='left' means a value must exceed a threshold to move up a bucket ("> x" ladders),
+    # side='right' means reaching it is enough ("< x" ladders where higher is riskier).
+    _NEUTRAL_RISK = 5.0
+    _RISK_TABLES = {
+        'liquidity': ('current_ratio', np.array([1.0, 1.5, 2.0]), np.array([9.0, 6.0, 4.0, 2.0]), 'left'),
+        'leverage': ('debt_to_equity', np.array([0.3, 0.6, 1.0]), np.array([2.0, 4.0, 6.0, 8.0]), 'right'),
+        'profitability': ('roe', np.array([0.05, 0.10, 0.15]), np.array([8.0, 6.0, 4.0, 2.0]), 'left'),
+        'valuation': ('pe_ratio', np.array([15.0, 25.0, 35.0]), np.array([3.0, 5.0, 7.0, 9.0]), 'right'),
+    }
+    _RISK_THRESHOLDS = np.stack([table[1] for table in _RISK_TABLES.values()])
+    _RISK_SCORES = np.stack([table[2] for table in _RISK_TABLES.values()])
+    _RISK_STRICT = np.array([table[3] == 'left' for table in _RISK_TABLES.values()])
+    
+    @property
+    def color_palette(self) -> Mapping[str, str]:
+        """Shared read-only palette (kept as an attribute-style accessor for callers)"""
+        return self._COLOR_PALETTE
     
     def create_financial_dashboard(self, financial_data: Dict) -> go.Figure:
         """Create comprehensive financial dashboard"""
         
+        hist_data = self._resolve_history(financial_data)
+        ratios = financial_data.get('financial_ratios', {})
+        
+        return self._build_financial_dashboard(hist_data, ratios)
+    
+    def _resolve_history(self, financial_data: Dict) -> pd.DataFrame:
+        """1y history from the caller's data, else from the shared cached fetch"""
         yf_data = financial_data.get('yfinance_data', {})
+        hist_data = yf_data.get('historical_1y')
+        if hist_data is None:
+            ticker = yf_data.get('info', {}).get('symbol')
+            hist_data = _fetch_history(ticker, "1y") if ticker else pd.DataFrame()
+        return hist_data
+    
+    def render_all(self, data: Dict) -> Dict[str, go.Figure]:
+        """Build the analysis-page figures concurrently.
+        
+        `data` is the dict returned by AdvancedDataAggregator.get_comprehensive_data.
+        The history fetch happens up front so only pure figure construction runs in the pool.
+        """
+        financial_data = data.get('financial_data', {})
+        sentiment_data = data.get('sentiment_data', {})
+        hist_data = self._resolve_history(financial_data)
         ratios = financial_data.get('financial_ratios', {})
         
-        # Create subplots
-        fig = make_subplots(
-            rows=3, cols=2,
-            subplot_titles=(
-                'Stock Price Trend (1 Year)', 'Volume Analysis',
-                'Financial Ratios Overview', 'Profitability Metrics',
-                'Price vs Moving Averages', 'Volatility Analysis'
-            ),
-            specs=[
-                [{"secondary_y": True}, {"secondary_y": False}],
-                [{"type": "bar"}, {"type": "bar"}],
-                [{"secondary_y": True}, {"type": "scatter"}]
-            ]
-        )
+        jobs = {
+            'dashboard': (self._build_financial_dashboard, hist_data, ratios),
+            'sentiment': (self.create_sentiment_analysis_chart, sentiment_data),
+            'ratios_heatmap': (self.create_financial_ratios_heatmap, ratios),
+            'risk_assessment': (self.create_risk_assessment_chart, financial_data),
+        }
+        
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            futures = {name: executor.submit(*job) for name, job in jobs.items()}
+            return {name: future.result() for name, future in futures.items()}
+    
+    @_memoized_figure
+    def _build_financial_dashboard(self, hist_data: pd.DataFrame, ratios: Dict) -> go.Figure:
+        """Build the six-panel dashboard figure from price history and ratios"""
+        
+        hist_data = _compact_prices(hist_data)
+        
+        # Create subplots from the cached empty skeleton
+        fig = go.Figure(_dashboard_skeleton())
         
         # 1. Stock Price Trend
-        hist_data = yf_data.get('historical_1y', pd.DataFrame())
+        Trace = _line_trace_type(len(hist_data))
         if not hist_data.empty:
             fig.add_trace(
-                go.Scatter(
+                Trace(
                     x=hist_data.index,
                     y=hist_data['Close'],
                     name='Close Price',
@@ -62,7 +286,7 @@ class AdvancedVisualizer:
             fig.add_trace(
                 go.Bar(
                     x=hist_data.index,
-                    y=hist_data['Volume'],
+                    y=_volume_array(hist_data['Volume']),
                     name='Volume',
                     marker_color=self.color_palette['secondary'],
                     opacity=0.3
@@ -72,20 +296,13 @@ class AdvancedVisualizer:
         
         # 2. Financial Ratios
         if ratios.get('valuation'):
-            valuation_ratios = ratios['valuation']
-            ratio_names = []
-            ratio_values = []
-            
-            for key, value in valuation_ratios.items():
-                if value is not None and isinstance(value, (int, float)):
-                    ratio_names.append(key.replace('_', ' ').title())
-                    ratio_values.append(value)
+            ratio_names, ratio_values = _clean_numeric_dict(ratios['valuation'])
             
             if ratio_names:
                 fig.add_trace(
                     go.Bar(
                         x=ratio_names,
-                        y=ratio_values,
+                        y=_f32(ratio_values),
                         name='Valuation Ratios',
                         marker_color=self.color_palette['success']
                     ),
@@ -94,20 +311,14 @@ class AdvancedVisualizer:
         
         # 3. Profitability Metrics
         if ratios.get('profitability'):
-            prof_ratios = ratios['profitability']
-            prof_names = []
-            prof_values = []
-            
-            for key, value in prof_ratios.items():
-                if value is not None and isinstance(value, (int, float)):
-                    prof_names.append(key.replace('_', ' ').title())
-                    prof_values.append(value * 100 if value < 1 else value)  # Convert to percentage
+            prof_names, prof_values = _clean_numeric_dict(ratios['profitability'])
+            prof_values = _as_percentages(prof_values)
             
             if prof_names:
                 fig.add_trace(
                     go.Bar(
                         x=prof_names,
-                        y=prof_values,
+                        y=_f32(prof_values),
                         name='Profitability %',
                         marker_color=self.color_palette['info']
                     ),
@@ -116,11 +327,10 @@ class AdvancedVisualizer:
         
         # 4. Moving Averages
         if not hist_data.empty:
-            hist_data['MA20'] = hist_data['Close'].rolling(window=20).mean()
-            hist_data['MA50'] = hist_data['Close'].rolling(window=50).mean()
+            ma20, ma50 = _rolling_stats(hist_data['Close'].to_numpy(), (20, 50))['mean']
             
             fig.add_trace(
-                go.Scatter(
+                Trace(
                     x=hist_data.index,
                     y=hist_data['Close'],
                     name='Price',
@@ -130,9 +340,9 @@ class AdvancedVisualizer:
             )
             
             fig.add_trace(
-                go.Scatter(
+                Trace(
                     x=hist_data.index,
-                    y=hist_data['MA20'],
+                    y=_f32(ma20),
                     name='MA20',
                     line=dict(color=self.color_palette['warning'])
                 ),
@@ -140,9 +350,9 @@ class AdvancedVisualizer:
             )
             
             fig.add_trace(
-                go.Scatter(
+                Trace(
                     x=hist_data.index,
-                    y=hist_data['MA50'],
+                    y=_f32(ma50),
                     name='MA50',
                     line=dict(color=self.color_palette['danger'])
                 ),
@@ -151,13 +361,12 @@ class AdvancedVisualizer:
         
         # 5. Volatility Analysis
         if not hist_data.empty:
-            returns = hist_data['Close'].pct_change().dropna()
-            volatility_30d = returns.rolling(window=30).std() * np.sqrt(252)  # Annualized
+            volatility_30d = _rolling_annualized_volatility(hist_data['Close'].to_numpy(), window=30)
             
             fig.add_trace(
-                go.Scatter(
-                    x=volatility_30d.index,
-                    y=volatility_30d * 100,  # Convert to percentage
+                Trace(
+                    x=hist_data.index[1:],
+                    y=_f32(volatility_30d * 100),  # Convert to percentage
                     name='30-Day Volatility %',
                     line=dict(color=self.color_palette['danger']),
                     mode='lines'
@@ -173,8 +382,9 @@ class AdvancedVisualizer:
             title_font_size=20
         )
         
-        return fig
+        return _maybe_resample(fig, len(hist_data))
     
+    @_memoized_figure
     def create_sentiment_analysis_chart(self, sentiment_data: Dict) -> go.Figure:
         """Create sentiment analysis visualization"""
         
@@ -191,18 +401,8 @@ class AdvancedVisualizer:
             )
             return fig
         
-        # Create subplots for sentiment analysis
-        fig = make_subplots(
-            rows=2, cols=2,
-            subplot_titles=(
-                'Sentiment Distribution (VADER)', 'Sentiment Over Time',
-                'News Source Breakdown', 'Sentiment Confidence'
-            ),
-            specs=[
-                [{"type": "pie"}, {"type": "scatter"}],
-                [{"type": "bar"}, {"type": "bar"}]
-            ]
-        )
+        # Create subplots for sentiment analysis from the cached empty skeleton
+        fig = go.Figure(_sentiment_skeleton())
         
         # VADER Sentiment Distribution
         vader_sentiment = sentiment_summary.get('vader_sentiment', {})
@@ -245,24 +445,25 @@ class AdvancedVisualizer:
                 row=2, col=1
             )
         
-        # News articles timeline (mock data for demonstration)
+        # News articles timeline
         articles = sentiment_data.get('news_articles', [])
         if articles:
             # Group articles by date for timeline
-            dates = []
-            sentiment_scores = []
+            dated = [article for article in articles[:10] if article.get('published_at')]  # Limit to 10 for visualization
+            dates = [article['published_at'][:10] for article in dated]  # Extract date
             
-            for article in articles[:10]:  # Limit to 10 for visualization
-                if article.get('published_at'):
-                    dates.append(article['published_at'][:10])  # Extract date
-                    # Mock sentiment score for visualization
-                    sentiment_scores.append(np.random.uniform(-1, 1))
+            # VADER compound score per article (set by analyze_sentiment); mock the
+            # ones that carry none, e.g. articles with no title or description
+            sentiment_scores = np.array([article.get('compound', np.nan) for article in dated], dtype=np.float64)
+            missing = np.isnan(sentiment_scores)
+            sentiment_scores[missing] = _RNG.uniform(-1, 1, size=int(missing.sum()))
             
             if dates:
+                Trace = _line_trace_type(len(dates))
                 fig.add_trace(
-                    go.Scatter(
+                    Trace(
                         x=dates,
-                        y=sentiment_scores,
+                        y=_f32(sentiment_scores),
                         mode='markers+lines',
                         name='Article Sentiment',
                         marker=dict(
@@ -299,22 +500,19 @@ class AdvancedVisualizer:
     def create_financial_ratios_heatmap(self, ratios_data: Dict) -> go.Figure:
         """Create a heatmap of financial ratios"""
         
-        # Prepare data for heatmap
-        categories = []
-        metrics = []
-        values = []
+        # Prepare data for heatmap: one cell per (metric, category) pair
+        cells = {}
         
         for category, ratios in ratios_data.items():
             if isinstance(ratios, dict):
-                for metric, value in ratios.items():
-                    if value is not None and isinstance(value, (int, float)):
-                        categories.append(category.replace('_', ' ').title())
-                        metrics.append(metric.replace('_', ' ').title())
-                        # Normalize values for better visualization
-                        normalized_value = min(max(value, -5), 5) if abs(value) > 1 else value
-                        values.append(normalized_value)
-        
-        if not values:
+                names, numbers = _clean_numeric_dict(ratios)
+                column = category.replace('_', ' ').title()
+                # Normalize values for better visualization
+                numbers = np.where(np.abs(numbers) > 1, np.clip(numbers, -5, 5), numbers)
+                for name, value in zip(names, numbers):
+                    cells[(name, column)] = value
+        
+        if not cells:
             fig = go.Figure()
             fig.add_annotation(
                 text="No ratio data available for heatmap",
@@ -324,22 +522,22 @@ class AdvancedVisualizer:
             )
             return fig
         
-        # Create DataFrame for heatmap
-        df = pd.DataFrame({
-            'Category': categories,
-            'Metric': metrics,
-            'Value': values
-        })
+        # Build the Metric x Category matrix directly; missing cells stay 0
+        metrics = sorted({metric for metric, _ in cells})
+        categories = sorted({category for _, category in cells})
+        row_of = {metric: i for i, metric in enumerate(metrics)}
+        col_of = {category: j for j, category in enumerate(categories)}
         
-        # Pivot for heatmap
-        heatmap_data = df.pivot_table(index='Metric', columns='Category', values='Value', fill_value=0)
+        matrix = np.zeros((len(metrics), len(categories)))
+        for (metric, category), value in cells.items():
+            matrix[row_of[metric], col_of[category]] = value
         
         fig = go.Figure(data=go.Heatmap(
-            z=heatmap_data.values,
-            x=heatmap_data.columns,
-            y=heatmap_data.index,
+            z=_f32(matrix),
+            x=categories,
+            y=metrics,
             colorscale='RdYlGn',
-            text=heatmap_data.values,
+            text=matrix,
             texttemplate="%{text:.2f}",
             textfont={"size": 10},
             hoverongaps=False
@@ -362,18 +560,13 @@ class AdvancedVisualizer:
             ratios = company_data.get('financial_ratios', {})
             profitability = ratios.get('profitability', {})
             
-            metrics = []
-            values = []
-            
-            for metric, value in profitability.items():
-                if value is not None and isinstance(value, (int, float)):
-                    metrics.append(metric.replace('_', ' ').title())
-                    values.append(value * 100 if value < 1 else value)
+            metrics, values = _clean_numeric_dict(profitability)
+            values = _as_percentages(values)
             
             fig = go.Figure()
             fig.add_trace(go.Bar(
                 x=metrics,
-                y=values,
+                y=_f32(values),
                 name='Company Metrics',
                 marker_color=self.color_palette['primary']
             ))
@@ -404,17 +597,15 @@ class AdvancedVisualizer:
         
         ratios = financial_data.get('financial_ratios', {})
         
-        # Risk factors
-        risk_factors = {
-            'Liquidity Risk': self.assess_liquidity_risk(ratios.get('liquidity', {})),
-            'Leverage Risk': self.assess_leverage_risk(ratios.get('leverage', {})),
-            'Profitability Risk': self.assess_profitability_risk(ratios.get('profitability', {})),
-            'Valuation Risk': self.assess_valuation_risk(ratios.get('valuation', {}))
-        }
+        # Risk factors, scored in one vectorized pass
+        metric_values = np.array(
+            [(ratios.get(family) or {}).get(key) for family, (key, *_) in self._RISK_TABLES.items()],
+            dtype=np.float64
+        )
         
         # Create radar chart
-        categories = list(risk_factors.keys())
-        values = list(risk_factors.values())
+        categories = [f"{family.title()} Risk" for family in self._RISK_TABLES]
+        values = self._score_risks(metric_values).tolist()
         
         fig = go.Figure()
         
@@ -438,184 +629,159 @@ class AdvancedVisualizer:
         
         return fig
     
+    def _score_risks(self, values: np.ndarray) -> np.ndarray:
+        """Score every risk family at once.
+        
+        `values` has one row per _RISK_TABLES family (shape (4,) or (4, P) for P companies);
+        NaN marks a missing ratio and scores as neutral risk.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        flat = values.reshape(len(self._RISK_TABLES), -1)[:, :, None]
+        thresholds = self._RISK_THRESHOLDS[:, None, :]
+        
+        crossed = np.where(self._RISK_STRICT[:, None, None], thresholds < flat, thresholds <= flat)
+        scores = np.take_along_axis(self._RISK_SCORES, crossed.sum(axis=2), axis=1)
+        
+        return np.where(np.isnan(flat[:, :, 0]), self._NEUTRAL_RISK, scores).reshape(values.shape)
+    
+    def _assess_risk(self, family: str, ratios: Dict) -> float:
+        """Score one risk family (0-10 scale, 10 being highest risk) from its lookup table"""
+        key, thresholds, scores, side = self._RISK_TABLES[family]
+        value = ratios.get(key)
+        
+        if value is None:
+            return self._NEUTRAL_RISK
+        
+        return float(scores[np.searchsorted(thresholds, value, side=side)])
+    
     def assess_liquidity_risk(self, liquidity_ratios: Dict) -> float:
         """Assess liquidity risk (0-10 scale, 10 being highest risk)"""
-        current_ratio = liquidity_ratios.get('current_ratio')
-        quick_ratio = liquidity_ratios.get('quick_ratio')
-        
-        if current_ratio is None:
-            return 5.0  # Neutral risk
-        
-        if current_ratio > 2.0:
-            return 2.0  # Low risk
-        elif current_ratio > 1.5:
-            return 4.0  # Medium-low risk
-        elif current_ratio > 1.0:
-            return 6.0  # Medium risk
-        else:
-            return 9.0  # High risk
+        return self._assess_risk('liquidity', liquidity_ratios)
     
     def assess_leverage_risk(self, leverage_ratios: Dict) -> float:
         """Assess leverage risk"""
-        debt_to_equity = leverage_ratios.get('debt_to_equity')
-        
-        if debt_to_equity is None:
-            return 5.0
-        
-        if debt_to_equity < 0.3:
-            return 2.0
-        elif debt_to_equity < 0.6:
-            return 4.0
-        elif debt_to_equity < 1.0:
-            return 6.0
-        else:
-            return 8.0
+        return self._assess_risk('leverage', leverage_ratios)
     
     def assess_profitability_risk(self, profitability_ratios: Dict) -> float:
         """Assess profitability risk"""
-        roe = profitability_ratios.get('roe')
-        profit_margin = profitability_ratios.get('profit_margin')
-        
-        if roe is None and profit_margin is None:
-            return 5.0
-        
         # Use ROE as primary indicator
-        if roe is not None:
-            if roe > 0.15:
-                return 2.0
-            elif roe > 0.10:
-                return 4.0
-            elif roe > 0.05:
-                return 6.0
-            else:
-                return 8.0
-        
-        return 5.0
+        return self._assess_risk('profitability', profitability_ratios)
     
     def assess_valuation_risk(self, valuation_ratios: Dict) -> float:
         """Assess valuation risk"""
-        pe_ratio = valuation_ratios.get('pe_ratio')
-        
-        if pe_ratio is None:
-            return 5.0
-        
-        if pe_ratio < 15:
-            return 3.0
-        elif pe_ratio < 25:
-            return 5.0
-        elif pe_ratio < 35:
-            return 7.0
-        else:
-            return 9.0
+        return self._assess_risk('valuation', valuation_ratios)
 
     def create_price_chart(self, ticker: str) -> Optional[go.Figure]:
         """Create a comprehensive price chart with technical indicators"""
         try:
-            import yfinance as yf
-            
             # Fetch stock data
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period="1y")
+            hist = _fetch_history(ticker, "1y")
             
             if hist.empty:
                 return None
             
-            # Create subplots with secondary y-axis
-            fig = make_subplots(
-                rows=2, cols=1,
-                subplot_titles=[f'{ticker} Stock Price', 'Volume'],
-                specs=[[{"secondary_y": True}], [{"secondary_y": False}]],
-                vertical_spacing=0.3,
-                row_heights=[0.7, 0.3]
-            )
-            
-            # Add candlestick chart
-            fig.add_trace(
-                go.Candlestick(
-                    x=hist.index,
-                    open=hist['Open'],
-                    high=hist['High'],
-                    low=hist['Low'],
-                    close=hist['Close'],
-                    name=f'{ticker} Price',
-                    increasing_line_color=self.color_palette['success'],
-                    decreasing_line_color=self.color_palette['danger']
-                ),
-                row=1, col=1
-            )
-            
-            # Add moving averages
-            hist['MA20'] = hist['Close'].rolling(window=20).mean()
-            hist['MA50'] = hist['Close'].rolling(window=50).mean()
-            hist['MA200'] = hist['Close'].rolling(window=200).mean()
-            
-            fig.add_trace(
-                go.Scatter(
-                    x=hist.index,
-                    y=hist['MA20'],
-                    mode='lines',
-                    name='MA 20',
-                    line=dict(color=self.color_palette['primary'], width=1)
-                ),
-                row=1, col=1
-            )
-            
-            fig.add_trace(
-                go.Scatter(
-                    x=hist.index,
-                    y=hist['MA50'],
-                    mode='lines',
-                    name='MA 50',
-                    line=dict(color=self.color_palette['secondary'], width=1)
-                ),
-                row=1, col=1
-            )
-            
-            fig.add_trace(
-                go.Scatter(
-                    x=hist.index,
-                    y=hist['MA200'],
-                    mode='lines',
-                    name='MA 200',
-                    line=dict(color=self.color_palette['warning'], width=2)
-                ),
-                row=1, col=1
-            )
-            
-            # Add volume bars
-            fig.add_trace(
-                go.Bar(
-                    x=hist.index,
-                    y=hist['Volume'],
-                    name='Volume',
-                    marker_color=self.color_palette['info'],
-                    opacity=0.7
-                ),
-                row=2, col=1
-            )
-            
-            # Update layout
-            fig.update_layout(
-                title=f'{ticker} Stock Analysis',
-                template='plotly_white',
-                height=600,
-                showlegend=True,
-                xaxis_rangeslider_visible=False
-            )
-            
-            # Update x-axis
-            fig.update_xaxes(title_text="Date", row=2, col=1)
-            
-            # Update y-axis
-            fig.update_yaxes(title_text="Price ($)", row=1, col=1)
-            fig.update_yaxes(title_text="Volume", row=2, col=1)
-            
-            return fig
+            return self._build_price_chart(ticker, hist)
             
         except Exception as e:
             st.error(f"Error creating price chart: {e}")
             return None
 
+    @_memoized_figure
+    def _build_price_chart(self, ticker: str, hist: pd.DataFrame) -> go.Figure:
+        """Build the candlestick/moving-average/volume figure for a price history"""
+        hist = _compact_prices(hist)
+        Trace = _line_trace_type(len(hist))
+        
+        # Create subplots with secondary y-axis
+        fig = make_subplots(
+            rows=2, cols=1,
+            subplot_titles=[f'{ticker} Stock Price', 'Volume'],
+            specs=[[{"secondary_y": True}], [{"secondary_y": False}]],
+            vertical_spacing=0.3,
+            row_heights=[0.7, 0.3]
+        )
+        
+        # Add candlestick chart
+        fig.add_trace(
+            go.Candlestick(
+                x=hist.index,
+                open=hist['Open'],
+                high=hist['High'],
+                low=hist['Low'],
+                close=hist['Close'],
+                name=f'{ticker} Price',
+                increasing_line_color=self.color_palette['success'],
+                decreasing_line_color=self.color_palette['danger']
+            ),
+            row=1, col=1
+        )
+        
+        # Add moving averages
+        ma20, ma50, ma200 = _rolling_stats(hist['Close'].to_numpy(), (20, 50, 200))['mean']
+        
+        fig.add_trace(
+            Trace(
+                x=hist.index,
+                y=_f32(ma20),
+                mode='lines',
+                name='MA 20',
+                line=dict(color=self.color_palette['primary'], width=1)
+            ),
+            row=1, col=1
+        )
+        
+        fig.add_trace(
+            Trace(
+                x=hist.index,
+                y=_f32(ma50),
+                mode='lines',
+                name='MA 50',
+                line=dict(color=self.color_palette['secondary'], width=1)
+            ),
+            row=1, col=1
+        )
+        
+        fig.add_trace(
+            Trace(
+                x=hist.index,
+                y=_f32(ma200),
+                mode='lines',
+                name='MA 200',
+                line=dict(color=self.color_palette['warning'], width=2)
+            ),
+            row=1, col=1
+        )
+        
+        # Add volume bars
+        fig.add_trace(
+            go.Bar(
+                x=hist.index,
+                y=_volume_array(hist['Volume']),
+                name='Volume',
+                marker_color=self.color_palette['info'],
+                opacity=0.7
+            ),
+            row=2, col=1
+        )
+        
+        # Update layout
+        fig.update_layout(
+            title=f'{ticker} Stock Analysis',
+            template='plotly_white',
+            height=600,
+            showlegend=True,
+            xaxis_rangeslider_visible=False
+        )
+        
+        # Update x-axis
+        fig.update_xaxes(title_text="Date", row=2, col=1)
+        
+        # Update y-axis
+        fig.update_yaxes(title_text="Price ($)", row=1, col=1)
+        fig.update_yaxes(title_text="Volume", row=2, col=1)
+        
+        return _maybe_resample(fig, len(hist))
+
     def create_financial_ratios_chart(self, financial_metrics: Dict) -> Optional[go.Figure]:
         """Create a financial ratios visualization chart"""
         try:
@@ -7,16 +7,31 @@ IMPORTANT: This server should be run from within the .venv virtual environment
 to ensure all dependencies are available.
 """
 
-from flask import Flask, jsonify, request, send_file
+from flask import Flask, Response, request, send_file
 from flask_cors import CORS
 import os
 import sys
 import json
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
+from io import BytesIO
 import yfinance as yf
 import pandas as pd
+import numpy as np
 import re
-from difflib import SequenceMatcher
+from rapidfuzz import fuzz, process
+from bisect import bisect_left
+import heapq
+from functools import lru_cache
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache, cached
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Verify we're running in the virtual environment
 def check_virtual_env():
@@ -69,10 +84,87 @@ if BACKEND_AVAILABLE:
         print(f"Warning: Could not initialize backend components: {e}")
         BACKEND_AVAILABLE = False
 
+def _normalize(symbol):
+    """Canonical ticker form (stripped, upper-case) used for lookups and cache keys"""
+    return (symbol or '').strip().upper()
+
+def ojsonify(obj):
+    """JSON response encoded with orjson when installed, stdlib json otherwise"""
+    if ORJSON_AVAILABLE:
+        body = orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        body = json.dumps(obj)
+    return Response(body, mimetype='application/json')
+
+# Worker pool for blocking yfinance calls that can run side by side
+_io_pool = ThreadPoolExecutor(max_workers=16)
+
+# Short-lived, bounded caches so back-to-back requests for a symbol skip Yahoo.
+# Each Ticker keeps its fetched data in memory, hence the modest maxsize.
+_ticker_cache = TTLCache(maxsize=512, ttl=60)
+_history_cache = TTLCache(maxsize=2048, ttl=30)
+
+@cached(_ticker_cache, lock=Lock())
+def get_ticker(symbol):
+    """Shared yfinance Ticker per symbol; its .info is fetched once per TTL window"""
+    return yf.Ticker(symbol)
+
+def fetch_info(symbol):
+    """Fetch the yfinance info dict for a symbol (blocking network I/O)"""
+    return get_ticker(symbol).info
+
+@cached(_history_cache, lock=Lock())
+def fetch_history(symbol, period):
+    """Fetch yfinance price history for a symbol (blocking network I/O)"""
+    return get_ticker(symbol).history(period=period)
+
+def build_stock_payload(symbol, original_symbol, info, hist, validation):
+    """Shape yfinance info and recent history into the stock-data response"""
+    # Last two rows as one float array: [close, volume] per row
+    columns = ['Close', 'Volume'] if 'Volume' in hist else ['Close']
+    tail = hist[columns].tail(2).to_numpy(dtype=np.float64)
+    current_price = tail[-1, 0]
+    prev_price = tail[-2, 0] if tail.shape[0] > 1 else current_price
+    last_volume = tail[-1, 1] if tail.shape[1] > 1 else np.nan
+    change = current_price - prev_price
+    change_percent = (change / prev_price) * 100
+    
+    # Determine market from symbol
+    market_info = None
+    dot = symbol.rfind('.')
+    if dot >= 0:
+        market_info = MARKET_SUFFIXES.get(symbol[dot:], 'Unknown Market')
+    else:
+        market_info = 'United States'
+    
+    data = {
+        'symbol': symbol,
+        'originalQuery': original_symbol,
+        'price': round(float(current_price), 2),
+        'change': round(float(change), 2),
+        'changePercent': round(float(change_percent), 2),
+        'volume': 0 if np.isnan(last_volume) else int(last_volume),
+        'marketCap': info.get('marketCap', 'N/A'),
+        'pe': round(float(info.get('trailingPE', 0)), 2) if info.get('trailingPE') and info.get('trailingPE') != 'N/A' else 'N/A',
+        'beta': round(float(info.get('beta', 0)), 3) if info.get('beta') and info.get('beta') != 'N/A' else 'N/A',
+        'week52High': round(float(info.get('fiftyTwoWeekHigh', 0)), 2) if info.get('fiftyTwoWeekHigh') else 'N/A',
+        'week52Low': round(float(info.get('fiftyTwoWeekLow', 0)), 2) if info.get('fiftyTwoWeekLow') else 'N/A',
+        'marketInfo': market_info,
+        'companyName': info.get('longName', info.get('shortName', 'N/A')),
+        'currency': info.get('currency', 'USD'),
+        'validation': {
+            'isValid': validation.get('is_valid', True),
+            'formatCorrect': True,
+            'dataAvailable': True
+        }
+    }
+    
+    return data
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
+    return ojsonify({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
         'backend_available': BACKEND_AVAILABLE
@@ -88,7 +180,7 @@ def get_status():
         'advancedCharts': BACKEND_AVAILABLE,
         'pdfGeneration': BACKEND_AVAILABLE,
     }
-    return jsonify(status)
+    return ojsonify(status)
 
 @app.route('/api/search-stocks', methods=['GET'])
 def search_stocks():
@@ -96,7 +188,7 @@ def search_stocks():
     query = request.args.get('q', '').strip()
     
     if len(query) < 1:
-        return jsonify({'suggestions': []})
+        return ojsonify({'suggestions': []})
     
     try:
         # Use enhanced search
@@ -115,42 +207,42 @@ def search_stocks():
         if not suggestions and validation.get('suggestions'):
             response['format_suggestions'] = validation['suggestions'][:5]
         
-        return jsonify(response)
+        return ojsonify(response)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}), 500
 
 @app.route('/api/validate-ticker', methods=['GET'])
 def validate_ticker():
     """Validate ticker format and suggest corrections"""
-    symbol = request.args.get('symbol', '').strip()
+    symbol = _normalize(request.args.get('symbol'))
     
     if not symbol:
-        return jsonify({'error': 'Symbol parameter required'}), 400
+        return ojsonify({'error': 'Symbol parameter required'}), 400
     
     try:
-        validation = validate_ticker_format(symbol)
-        return jsonify(validation)
+        validation = validate_ticker_format(symbol, already_normalized=True)
+        return ojsonify(validation)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}), 500
 
 @app.route('/api/stock-data', methods=['GET'])
 def get_stock_data():
     """Get basic stock data with enhanced validation and error handling"""
-    symbol = request.args.get('symbol', '').strip()
+    original_symbol = request.args.get('symbol', '').strip()
+    symbol = _normalize(original_symbol)
     
     if not symbol:
-        return jsonify({'error': 'Symbol parameter required'}), 400
+        return ojsonify({'error': 'Symbol parameter required'}), 400
     
     # Validate ticker format first
-    validation = validate_ticker_format(symbol)
-    original_symbol = symbol
-    symbol = symbol.upper()
+    validation = validate_ticker_format(symbol, already_normalized=True)
     
     try:
-        # Get data using yfinance
-        stock = yf.Ticker(symbol)
-        info = stock.info
-        hist = stock.history(period='5d')
+        # Get data using yfinance; info and history are independent round trips
+        info_future = _io_pool.submit(fetch_info, symbol)
+        hist_future = _io_pool.submit(fetch_history, symbol, '5d')
+        info = info_future.result(timeout=10)
+        hist = hist_future.result(timeout=10)
         
         # Check if we got valid data
         if hist.empty or len(hist) == 0:
@@ -169,7 +261,7 @@ def get_stock_data():
                     ]
                 }
             }
-            return jsonify(error_response), 404
+            return ojsonify(error_response), 404
         
         # Check if this looks like valid stock data
         if info.get('regularMarketPrice') is None and info.get('previousClose') is None:
@@ -179,44 +271,11 @@ def get_stock_data():
                 'validation': validation,
                 'note': 'Symbol may be valid but market is closed or data unavailable'
             }
-            return jsonify(error_response), 404
-        
-        current_price = hist['Close'].iloc[-1]
-        prev_price = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
-        change = current_price - prev_price
-        change_percent = (change / prev_price) * 100
-        
-        # Determine market from symbol
-        market_info = None
-        if '.' in symbol:
-            suffix = '.' + symbol.split('.', 1)[1]
-            market_info = MARKET_SUFFIXES.get(suffix, 'Unknown Market')
-        else:
-            market_info = 'United States'
+            return ojsonify(error_response), 404
         
-        data = {
-            'symbol': symbol,
-            'originalQuery': original_symbol,
-            'price': round(float(current_price), 2),
-            'change': round(float(change), 2),
-            'changePercent': round(float(change_percent), 2),
-            'volume': int(hist['Volume'].iloc[-1]) if 'Volume' in hist and not pd.isna(hist['Volume'].iloc[-1]) else 0,
-            'marketCap': info.get('marketCap', 'N/A'),
-            'pe': round(float(info.get('trailingPE', 0)), 2) if info.get('trailingPE') and info.get('trailingPE') != 'N/A' else 'N/A',
-            'beta': round(float(info.get('beta', 0)), 3) if info.get('beta') and info.get('beta') != 'N/A' else 'N/A',
-            'week52High': round(float(info.get('fiftyTwoWeekHigh', 0)), 2) if info.get('fiftyTwoWeekHigh') else 'N/A',
-            'week52Low': round(float(info.get('fiftyTwoWeekLow', 0)), 2) if info.get('fiftyTwoWeekLow') else 'N/A',
-            'marketInfo': market_info,
-            'companyName': info.get('longName', info.get('shortName', 'N/A')),
-            'currency': info.get('currency', 'USD'),
-            'validation': {
-                'isValid': validation.get('is_valid', True),
-                'formatCorrect': True,
-                'dataAvailable': True
-            }
-        }
+        data = build_stock_payload(symbol, original_symbol, info, hist, validation)
         
-        return jsonify(data)
+        return ojsonify(data)
     except Exception as e:
         # Enhanced error handling with suggestions
         error_response = {
@@ -232,50 +291,109 @@ def get_stock_data():
                 ]
             }
         }
-        return jsonify(error_response), 500
+        return ojsonify(error_response), 500
+
+# Each symbol costs an .info call, so cap how many one request can fan out to
+MAX_BATCH_SYMBOLS = 50
+
+@app.route('/api/stock-data-batch', methods=['GET'])
+def get_stock_data_batch():
+    """Get basic stock data for several symbols in one round trip"""
+    raw_symbols = [_normalize(s) for s in request.args.get('symbols', '').split(',')]
+    symbols = list(dict.fromkeys(s for s in raw_symbols if s))
+    
+    if not symbols:
+        return ojsonify({'error': 'Symbols parameter required'}), 400
+    if len(symbols) > MAX_BATCH_SYMBOLS:
+        return ojsonify({'error': f'At most {MAX_BATCH_SYMBOLS} symbols per request'}), 400
+    
+    def safe_info(symbol):
+        try:
+            return fetch_info(symbol)
+        except Exception:
+            return {}
+    
+    try:
+        # One batched price download; .info still needs a call per symbol, so run those in parallel
+        infos = _io_pool.map(safe_info, symbols)
+        prices = yf.download(symbols, period='5d', group_by='ticker', threads=True, progress=False)
+        infos = dict(zip(symbols, infos))
+        
+        stocks = {}
+        for symbol in symbols:
+            validation = validate_ticker_format(symbol, already_normalized=True)
+            if isinstance(prices.columns, pd.MultiIndex):
+                hist = prices[symbol] if symbol in prices.columns.get_level_values(0) else pd.DataFrame()
+            else:
+                hist = prices
+            hist = hist.dropna(how='all')
+            info = infos[symbol]
+            
+            if hist.empty:
+                stocks[symbol] = {'error': f'No data found for symbol "{symbol}"', 'validation': validation}
+            elif info.get('regularMarketPrice') is None and info.get('previousClose') is None:
+                stocks[symbol] = {'error': f'No market data available for symbol "{symbol}"', 'validation': validation}
+            else:
+                stocks[symbol] = build_stock_payload(symbol, symbol, info, hist, validation)
+        
+        return ojsonify({'stocks': stocks})
+    except Exception as e:
+        return ojsonify({'error': str(e)}), 500
 
 @app.route('/api/chart-data', methods=['GET'])
 def get_chart_data():
     """Get historical chart data"""
-    symbol = request.args.get('symbol', '').upper()
+    symbol = _normalize(request.args.get('symbol'))
     period = request.args.get('period', '1y')
     
     if not symbol:
-        return jsonify({'error': 'Symbol parameter required'}), 400
+        return ojsonify({'error': 'Symbol parameter required'}), 400
     
     try:
-        stock = yf.Ticker(symbol)
-        hist = stock.history(period=period)
+        hist = fetch_history(symbol, period)
         
-        chart_data = []
-        for date, row in hist.iterrows():
-            chart_data.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'price': round(float(row['Close']), 2),
-                'volume': int(row['Volume']) if 'Volume' in row else 0,
-            })
+        # Columnar arrays: each key is sent once instead of once per bar
+        if 'Volume' in hist:
+            volumes = hist['Volume'].fillna(0).astype(np.int64).tolist()
+        else:
+            volumes = [0] * len(hist)
         
-        return jsonify({'chartData': chart_data})
+        return ojsonify({
+            'dates': hist.index.strftime('%Y-%m-%d').tolist(),
+            'prices': hist['Close'].round(2).to_numpy(dtype=np.float64).tolist(),
+            'volumes': volumes,
+        })
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}), 500
+
+@lru_cache(maxsize=1)
+def _news_timestamps(second):
+    """ISO timestamps for the mock news items, built once per wall-clock second"""
+    now = datetime.fromtimestamp(second)
+    return (
+        now.isoformat(),
+        (now - timedelta(hours=6)).isoformat(),
+        (now - timedelta(hours=12)).isoformat(),
+    )
 
 @app.route('/api/news', methods=['GET'])
 def get_news():
     """Get news and sentiment data"""
-    symbol = request.args.get('symbol', '').upper()
+    symbol = _normalize(request.args.get('symbol'))
     
     if not symbol:
-        return jsonify({'error': 'Symbol parameter required'}), 400
+        return ojsonify({'error': 'Symbol parameter required'}), 400
     
     try:
         # For now, return mock news data since the data aggregator requires company name
         # which we don't have readily available in this context
+        latest, six_hours_ago, twelve_hours_ago = _news_timestamps(int(time.time()))
         mock_news = [
             {
                 'title': f'{symbol} Reports Strong Quarterly Results',
                 'description': f'{symbol} exceeded analyst expectations with strong revenue growth.',
                 'url': '#',
-                'publishedAt': datetime.now().isoformat(),
+                'publishedAt': latest,
                 'sentiment': 'positive',
                 'score': 0.8,
             },
@@ -283,7 +401,7 @@ def get_news():
                 'title': f'Market Analysis: {symbol} Maintains Strong Position',
                 'description': f'Analysts remain optimistic about {symbol}\'s market performance and growth prospects.',
                 'url': '#',
-                'publishedAt': (datetime.now() - pd.Timedelta(hours=6)).isoformat(),
+                'publishedAt': six_hours_ago,
                 'sentiment': 'positive',
                 'score': 0.6,
             },
@@ -291,23 +409,23 @@ def get_news():
                 'title': f'Industry Watch: {symbol} Sector Trends',
                 'description': f'Latest trends affecting {symbol} and similar companies in the sector.',
                 'url': '#',
-                'publishedAt': (datetime.now() - pd.Timedelta(hours=12)).isoformat(),
+                'publishedAt': twelve_hours_ago,
                 'sentiment': 'neutral',
                 'score': 0.2,
             }
         ]
-        return jsonify({'news': mock_news})
+        return ojsonify({'news': mock_news})
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}), 500
 
 @app.route('/api/analysis', methods=['GET'])
 def get_analysis():
     """Get AI analysis"""
-    symbol = request.args.get('symbol', '').upper()
+    symbol = _normalize(request.args.get('symbol'))
     level = request.args.get('level', 'basic')
     
     if not symbol:
-        return jsonify({'error': 'Symbol parameter required'}), 400
+        return ojsonify({'error': 'Symbol parameter required'}), 400
     
     try:
         # For now, return mock analysis data as the Gemini integration needs refinement
@@ -339,43 +457,38 @@ def get_analysis():
             analysis['weaknesses'].extend(['Regulatory challenges', 'Supply chain dependencies'])
             analysis['confidence'] = 0.85
         
-        return jsonify(analysis)
+        return ojsonify(analysis)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}), 500
 
 @app.route('/api/generate-pdf', methods=['POST'])
 def generate_pdf():
     """Generate comprehensive educational equity research PDF report"""
-    symbol = request.json.get('symbol', '').upper()
+    symbol = _normalize(request.json.get('symbol'))
     level = request.json.get('level', 'comprehensive')
     
     if not symbol:
-        return jsonify({'error': 'Symbol parameter required'}), 400
+        return ojsonify({'error': 'Symbol parameter required'}), 400
     
     try:
         # Use the comprehensive report generator
-        html_content = comprehensive_generator.generate_comprehensive_report(symbol)
+        html_content = comprehensive_generator.generate_comprehensive_report(symbol, inline_css=False)
         pdf_bytes = comprehensive_generator.generate_pdf_bytes(html_content)
         
         if pdf_bytes:
-            # Create a temporary file
-            import tempfile
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                tmp_file.write(pdf_bytes)
-                tmp_file_path = tmp_file.name
-            
+            # Serve straight from memory; no temp file to write or leak
             return send_file(
-                tmp_file_path, 
+                BytesIO(pdf_bytes),
                 as_attachment=True, 
                 download_name=f"{symbol}_Educational_Research_Report.pdf",
                 mimetype='application/pdf'
             )
         else:
-            return jsonify({'error': 'Failed to generate PDF'}), 500
+            return ojsonify({'error': 'Failed to generate PDF'}), 500
             
     except Exception as e:
         print(f"PDF generation error: {e}")
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}), 500
 
 # Comprehensive stock ticker database and validation
 MARKET_SUFFIXES = {
@@ -469,11 +582,47 @@ POPULAR_STOCKS = [
     {'symbol': 'NESN.SW', 'name': 'Nestlé S.A.', 'type': 'Equity', 'region': 'Switzerland', 'market': 'SIX'},
 ]
 
-def validate_ticker_format(symbol):
+# Base symbol (letters, digits, '-', '&', leading '^' for indices) plus an optional market suffix
+_TICKER_RE = re.compile(r'^([A-Z0-9&^\-]{1,20})(\.[A-Z]{1,3})?$')
+
+# Search index over POPULAR_STOCKS, normalized once at import
+_STOCK_BASE = [stock['symbol'].split('.')[0].lower() for stock in POPULAR_STOCKS]
+_STOCK_NAME = [stock['name'].lower() for stock in POPULAR_STOCKS]
+_BASE_INDEX = {base: i for i, base in reversed(list(enumerate(_STOCK_BASE)))}
+_SORTED_BASES = sorted((base, i) for i, base in enumerate(_STOCK_BASE))
+_SORTED_KEYS = [base for base, _ in _SORTED_BASES]
+_BASE_ARRAY = np.array(_STOCK_BASE)
+_NAME_ARRAY = np.array(_STOCK_NAME)
+
+def _prefix_hits(query_lower):
+    """Indices of stocks whose base symbol starts with the query"""
+    start = bisect_left(_SORTED_KEYS, query_lower)
+    hits = []
+    for base, i in _SORTED_BASES[start:]:
+        if not base.startswith(query_lower):
+            break
+        hits.append(i)
+    return hits
+
+def _fuzzy_scores(query, choices, cutoff=50):
+    """Map candidate index -> similarity in [0, 1] for choices scoring at or above cutoff"""
+    matches = process.extract(query, choices, scorer=fuzz.ratio, score_cutoff=cutoff, limit=None)
+    return {i: score / 100 for _, score, i in matches}
+
+def validate_ticker_format(symbol, already_normalized=False):
     """
     Validate and suggest proper ticker format for different markets.
     Returns dict with validation result and suggestions.
     """
+    if not already_normalized:
+        symbol = _normalize(symbol)
+    result = _validate_ticker_format(symbol)
+    # Copy the containers so callers can't mutate the cached result
+    return {**result, 'suggestions': list(result['suggestions'])}
+
+@lru_cache(maxsize=4096)
+def _validate_ticker_format(symbol):
+    """Memoized body of validate_ticker_format; expects a normalized symbol"""
     if not symbol:
         return {
             'is_valid': False,
@@ -482,18 +631,28 @@ def validate_ticker_format(symbol):
             'error': 'Symbol cannot be empty'
         }
     
-    symbol = symbol.strip().upper()
     original_symbol = symbol
     
+    # Reject anything that isn't shaped like a ticker before any fuzzy work
+    match = _TICKER_RE.match(symbol)
+    if not match:
+        return {
+            'is_valid': False,
+            'original': original_symbol,
+            'suggestions': [],
+            'error': 'Invalid ticker format'
+        }
+    suffix = match.group(2) or ''
+    
     # Check if it's already a valid format
-    if '.' in symbol:
-        base, suffix = symbol.split('.', 1)
-        if '.' + suffix in MARKET_SUFFIXES:
+    if suffix:
+        market = MARKET_SUFFIXES.get(suffix)
+        if market is not None:
             return {
                 'is_valid': True,
                 'original': original_symbol,
                 'corrected': symbol,
-                'market': MARKET_SUFFIXES['.' + suffix],
+                'market': market,
                 'suggestions': []
             }
     
@@ -501,7 +660,8 @@ def validate_ticker_format(symbol):
     suggestions = []
     
     # Check if it matches any known stocks
-    exact_matches = [stock for stock in POPULAR_STOCKS if stock['symbol'].split('.')[0] == symbol]
+    exact_index = _BASE_INDEX.get(symbol.lower())
+    exact_matches = [POPULAR_STOCKS[exact_index]] if exact_index is not None else []
     if exact_matches:
         for match in exact_matches:
             suggestions.append({
@@ -515,10 +675,9 @@ def validate_ticker_format(symbol):
     else:
         # Look for partial matches
         partial_matches = []
-        for stock in POPULAR_STOCKS:
+        for i, similarity in _fuzzy_scores(symbol.lower(), _STOCK_BASE, 60).items():
+            stock = POPULAR_STOCKS[i]
             base_symbol = stock['symbol'].split('.')[0]
-            # Check similarity
-            similarity = SequenceMatcher(None, symbol, base_symbol).ratio()
             if similarity > 0.6:  # 60% similarity threshold
                 partial_matches.append({
                     'symbol': stock['symbol'],
@@ -529,12 +688,11 @@ def validate_ticker_format(symbol):
                     'reason': f'Similar to {base_symbol}'
                 })
         
-        # Sort by confidence
-        partial_matches.sort(key=lambda x: x['confidence'], reverse=True)
-        suggestions.extend(partial_matches[:5])  # Top 5 matches
+        # Keep the most confident matches
+        suggestions.extend(heapq.nlargest(5, partial_matches, key=lambda x: x['confidence']))  # Top 5 matches
     
     # If no suffix provided, suggest common market variants
-    if '.' not in symbol and not exact_matches:
+    if not suffix and not exact_matches:
         market_suggestions = [
             {'symbol': symbol, 'name': f'{symbol} (US Market)', 'region': 'United States', 'market': 'US', 'confidence': 0.8, 'reason': 'US market (default)'},
             {'symbol': f'{symbol}.NS', 'name': f'{symbol} (India NSE)', 'region': 'India', 'market': 'NSE', 'confidence': 0.7, 'reason': 'India National Stock Exchange'},
@@ -554,103 +712,99 @@ def validate_ticker_format(symbol):
         }
     }
 
-def similarity(a, b):
-    """Calculate similarity between two strings"""
-    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+# Non-fuzzy match rules in precedence order: (match_type, confidence, highlighted field)
+_MATCH_RULES = (
+    ('exact_symbol', 1.0, 'symbol'),
+    ('symbol_prefix', 0.9, 'symbol'),
+    ('symbol_contains', 0.8, 'symbol'),
+    ('name_prefix', 0.7, 'name'),
+    ('name_contains', 0.6, 'name'),
+)
+
+def _match_ranks(query_lower):
+    """Index into _MATCH_RULES of the first rule each stock satisfies, -1 where none does"""
+    tests = (
+        _BASE_ARRAY == query_lower,
+        np.char.startswith(_BASE_ARRAY, query_lower),
+        np.char.find(_BASE_ARRAY, query_lower) >= 0,
+        np.char.startswith(_NAME_ARRAY, query_lower),
+        np.char.find(_NAME_ARRAY, query_lower) >= 0,
+    )
+    ranks = np.full(len(_STOCK_BASE), -1)
+    # Apply rules from lowest to highest precedence so the first match wins
+    for rank in reversed(range(len(tests))):
+        ranks[tests[rank]] = rank
+    return ranks
+
+def _search_result(i, match_type, confidence, field):
+    """Search hit for POPULAR_STOCKS[i], highlighting the matched field"""
+    stock = POPULAR_STOCKS[i]
+    return {
+        **stock,
+        'match_type': match_type,
+        'confidence': confidence,
+        'highlight': stock[field]
+    }
 
 def search_stocks_enhanced(query, limit=10):
     """
     Enhanced stock search with fuzzy matching and market-specific suggestions
     """
+    return [dict(result) for result in _search_stocks_enhanced(query, limit)]
+
+@lru_cache(maxsize=4096)
+def _search_stocks_enhanced(query, limit):
+    """Memoized body of search_stocks_enhanced; the result is shared between callers"""
     if not query or len(query) < 1:
         return []
     
-    query = query.strip()
-    results = []
+    query_lower = query.strip().lower()
     
-    # Search in popular stocks database
-    for stock in POPULAR_STOCKS:
-        symbol_base = stock['symbol'].split('.')[0]
-        name_lower = stock['name'].lower()
-        query_lower = query.lower()
-        
-        # Exact symbol match (highest priority)
-        if symbol_base.lower() == query_lower:
-            results.append({
-                **stock,
-                'match_type': 'exact_symbol',
-                'confidence': 1.0,
-                'highlight': stock['symbol']
-            })
-        # Symbol starts with query
-        elif symbol_base.lower().startswith(query_lower):
-            results.append({
-                **stock,
-                'match_type': 'symbol_prefix',
-                'confidence': 0.9,
-                'highlight': stock['symbol']
-            })
-        # Query is in symbol
-        elif query_lower in symbol_base.lower():
-            results.append({
-                **stock,
-                'match_type': 'symbol_contains',
-                'confidence': 0.8,
-                'highlight': stock['symbol']
-            })
-        # Company name starts with query
-        elif name_lower.startswith(query_lower):
-            results.append({
-                **stock,
-                'match_type': 'name_prefix',
-                'confidence': 0.7,
-                'highlight': stock['name']
-            })
-        # Query is in company name
-        elif query_lower in name_lower:
-            results.append({
-                **stock,
-                'match_type': 'name_contains',
-                'confidence': 0.6,
-                'highlight': stock['name']
-            })
-        # Fuzzy match for typos
-        elif (similarity(query_lower, symbol_base.lower()) > 0.7 or 
-              similarity(query_lower, name_lower) > 0.5):
-            results.append({
-                **stock,
-                'match_type': 'fuzzy',
-                'confidence': max(similarity(query_lower, symbol_base.lower()), 
-                                 similarity(query_lower, name_lower)),
-                'highlight': stock['symbol'] if similarity(query_lower, symbol_base.lower()) > 0.7 else stock['name']
-            })
-    
-    # Remove duplicates and sort by confidence
-    seen = set()
-    unique_results = []
-    for result in results:
-        if result['symbol'] not in seen:
-            seen.add(result['symbol'])
-            unique_results.append(result)
-    
-    # Sort by confidence (descending) and then by match type priority
-    match_type_priority = {
-        'exact_symbol': 1,
-        'symbol_prefix': 2,
-        'symbol_contains': 3,
-        'name_prefix': 4,
-        'name_contains': 5,
-        'fuzzy': 6
-    }
-    
-    unique_results.sort(key=lambda x: (match_type_priority[x['match_type']], -x['confidence']))
+    # Exact and prefix symbol hits outrank every other match type, so when
+    # they alone fill the limit the rest of the list never needs scoring
+    symbol_hits = sorted(_prefix_hits(query_lower), key=lambda i: (_STOCK_BASE[i] != query_lower, i))
+    if len(symbol_hits) >= limit:
+        return [
+            _search_result(i, *_MATCH_RULES[0 if _STOCK_BASE[i] == query_lower else 1])
+            for i in symbol_hits[:limit]
+        ]
     
-    return unique_results[:limit]
+    # Fuzzy scores for every candidate in one batched pass
+    symbol_scores = _fuzzy_scores(query_lower, _STOCK_BASE)
+    name_scores = _fuzzy_scores(query_lower, _STOCK_NAME)
+    
+    # Rank every stock in one columnar pass; (rank, -confidence, index) orders results by precedence
+    ranks = _match_ranks(query_lower)
+    ranked = []
+    for i in np.flatnonzero(ranks >= 0).tolist():
+        rank = int(ranks[i])
+        match_type, confidence, field = _MATCH_RULES[rank]
+        ranked.append((rank, -confidence, i, match_type, confidence, field))
+    
+    # Fuzzy match for typos, only among stocks no rule matched
+    for i in symbol_scores.keys() | name_scores.keys():
+        if ranks[i] >= 0:
+            continue
+        symbol_score = symbol_scores.get(i, 0.0)
+        name_score = name_scores.get(i, 0.0)
+        if symbol_score <= 0.7 and name_score <= 0.5:
+            continue
+        confidence = max(symbol_score, name_score)
+        field = 'symbol' if symbol_score > 0.7 else 'name'
+        ranked.append((len(_MATCH_RULES), -confidence, i, 'fuzzy', confidence, field))
+    
+    ranked.sort()
+    
+    return [
+        _search_result(i, match_type, confidence, field)
+        for _, _, i, match_type, confidence, field in ranked[:limit]
+    ]
 
 if __name__ == '__main__':
     print("🚀 Starting Bridge Server for Next.js Frontend")
     print(f"Backend modules available: {BACKEND_AVAILABLE}")
     print("Server will run on http://localhost:5001")
     print("Make sure your Next.js app is configured to proxy API calls to this server")
+    print("For concurrent use run: gunicorn -c gunicorn_conf.py bridge_server:app")
     
-    app.run(debug=True, port=5001, host='0.0.0.0')
+    app.run(port=5001, host='0.0.0.0', threaded=True)
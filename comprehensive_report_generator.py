@@ -4,27 +4,173 @@ Generates professional academic-style reports with all required sections
 """
 
 import os
-import json
-import base64
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-import yfinance as yf
-import pandas as pd
-from io import BytesIO
-import tempfile
+import re
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Tuple
+import numpy as np
+import pickle
+from functools import lru_cache
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from dataclasses import dataclass, field
+from threading import Lock
+from cachetools import TTLCache, cached
 
-try:
-    from weasyprint import HTML, CSS
-    WEASYPRINT_AVAILABLE = True
-except ImportError:
-    WEASYPRINT_AVAILABLE = False
+if TYPE_CHECKING:
+    # yfinance pulls in pandas; both load on the first download instead of at import
+    import yfinance as yf
+    import pandas as pd
 
-import plotly.graph_objects as go
-import plotly.io as pio
+class FileCache:
+    """Pickle files under <root>/<symbol>/<endpoint>.pkl, each stamped with its save time"""
+    
+    # Ticker-shaped keys only (no separators, never starting with a dot), so a symbol
+    # can't steer reads or writes outside root
+    _KEY_RE = re.compile(r'^[A-Za-z0-9^&=\-][A-Za-z0-9.^&=\-]{0,31}$')
+    
+    def __init__(self, root: str):
+        self.root = root
+    
+    def _path(self, symbol: str, endpoint: str) -> Optional[str]:
+        """File for symbol/endpoint, or None when either is not a safe cache key"""
+        if not (self._KEY_RE.match(symbol) and self._KEY_RE.match(endpoint)):
+            return None
+        root = os.path.realpath(self.root)
+        path = os.path.realpath(os.path.join(root, symbol, f"{endpoint}.pkl"))
+        if os.path.commonpath((root, path)) != root:
+            return None
+        return path
+    
+    def get(self, symbol: str, endpoint: str, ttl: timedelta) -> Optional[Any]:
+        """Cached value, or None when missing, unreadable or older than ttl"""
+        path = self._path(symbol, endpoint)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                saved_at, value = pickle.load(f)
+        except Exception:
+            # Includes pickles from older library versions (AttributeError,
+            # ModuleNotFoundError); a miss lets the next set() replace them
+            return None
+        if datetime.now() - saved_at > ttl:
+            return None
+        return value
+    
+    def set(self, symbol: str, endpoint: str, value: Any) -> None:
+        """Write atomically so concurrent readers never see a partial file"""
+        path = self._path(symbol, endpoint)
+        if path is None:
+            return
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((datetime.now(), value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Could not cache {endpoint} for {symbol}: {e}")
+    
+    def fetch(self, symbol: str, endpoint: str, ttl: timedelta, loader) -> Any:
+        """Return the cached value, calling loader and storing its result on a miss"""
+        value = self.get(symbol, endpoint, ttl)
+        if value is None:
+            value = loader()
+            self.set(symbol, endpoint, value)
+        return value
+    
+    def discard(self, endpoints) -> None:
+        """Delete the given endpoints for every cached symbol"""
+        try:
+            symbols = os.listdir(self.root)
+        except OSError:
+            return
+        for symbol in symbols:
+            for endpoint in endpoints:
+                path = self._path(symbol, endpoint)
+                if path is None:
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
 
-class ComprehensiveReportGenerator:
-    def __init__(self):
-        self.css_styles = """
+_disk_cache = FileCache(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'yfinance'))
+
+# Quotes and company info move daily; statements only change each reporting period
+_ENDPOINT_TTLS = {
+    'info': timedelta(days=1),
+    'close_prices': timedelta(days=1),
+    'financials': timedelta(days=30),
+}
+
+# Tickers and bundles pin downloaded DataFrames in memory, so only recent
+# symbols stay resident; the disk cache serves the rest. Entries expire well
+# inside the shortest disk TTL so a long-lived process never outlives it.
+_MEMORY_TTL = 15 * 60
+_ticker_cache = TTLCache(maxsize=16, ttl=_MEMORY_TTL)
+_bundle_cache = TTLCache(maxsize=16, ttl=_MEMORY_TTL)
+_memory_lock = Lock()
+
+@cached(_ticker_cache, lock=_memory_lock)
+def _get_ticker(symbol: str) -> "yf.Ticker":
+    """Shared yfinance Ticker per symbol"""
+    import yfinance as yf
+    return yf.Ticker(symbol)
+
+@cached(_bundle_cache, lock=_memory_lock)
+def _get_bundle(symbol: str) -> MappingProxyType:
+    """Download everything a report needs for a symbol once; read-only so cached data stays intact"""
+    ticker = _get_ticker(symbol)
+    loaders = {
+        'info': lambda: ticker.info,
+        'close_prices': lambda: _load_closes(ticker),
+        'financials': lambda: ticker.financials,
+    }
+    # The endpoints are independent HTTP calls, so fetch them side by side;
+    # each one is served from the on-disk cache while its TTL holds
+    with ThreadPoolExecutor(max_workers=len(loaders)) as pool:
+        futures = {
+            key: pool.submit(_disk_cache.fetch, symbol, key, _ENDPOINT_TTLS[key], loader)
+            for key, loader in loaders.items()
+        }
+        bundle = {key: future.result() for key, future in futures.items()}
+    
+    # Sections only read a couple of statement rows, so keep those as float
+    # arrays instead of holding on to the DataFrame
+    financials = bundle.pop('financials')
+    bundle['financial_years'] = list(financials.columns)
+    bundle['financial_rows'] = _statement_rows(financials)
+    return MappingProxyType(bundle)
+
+def _load_closes(ticker: "yf.Ticker") -> np.ndarray:
+    """Daily closes for the last two years; sections never read the other OHLCV columns"""
+    # Sections look back at most 252 sessions; 2y covers that with margin
+    hist = ticker.history(period="2y")
+    # float32 keeps ~7 significant digits, far more than the one- and two-decimal
+    # figures the report prints, and halves the array and its cache file
+    if hist.empty or 'Close' not in hist:
+        return np.empty(0, dtype=np.float32)
+    return hist['Close'].to_numpy(dtype=np.float32)
+
+def _statement_rows(frame: "pd.DataFrame") -> Dict[str, np.ndarray]:
+    """Statement rows keyed by lower-cased label, as float arrays aligned with the columns"""
+    values = frame.to_numpy(dtype=np.float64)
+    rows = {}
+    for label, row in zip(frame.index, values):
+        # Keep the first row when a label repeats
+        rows.setdefault(str(label).lower(), row)
+    return rows
+
+# Report stylesheet; parsed once for WeasyPrint instead of on every render
+def _minify_css(css: str) -> str:
+    """Stylesheet with comments dropped and whitespace collapsed, for inlining into every page"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    css = re.sub(r'\s+', ' ', css)
+    return re.sub(r'\s*([{};,])\s*', r'\1', css).strip()
+
+_CSS_STYLES = _minify_css("""
         @page {
             size: A4;
             margin: 2.5cm 2cm;
@@ -33,11 +179,6 @@ class ComprehensiveReportGenerator:
                 font-size: 10px;
                 color: #666;
             }
-            @top-right {
-                content: counter(page);
-                font-size: 10px;
-                color: #666;
-            }
             @bottom-center {
                 content: "Page " counter(page);
                 font-size: 10px;
@@ -92,6 +233,7 @@ class ComprehensiveReportGenerator:
         
         .financial-table {
             width: 100%;
+            table-layout: fixed;
             border-collapse: collapse;
             margin: 15px 0;
             font-size: 10px;
@@ -110,12 +252,18 @@ class ComprehensiveReportGenerator:
         }
         
         .metric-grid {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 20px;
+            display: flex;
+            flex-wrap: wrap;
+            justify-content: space-between;
             margin: 15px 0;
         }
         
+        .metric-grid .metric-box {
+            box-sizing: border-box;
+            width: 48%;
+            margin-bottom: 15px;
+        }
+        
         .metric-box {
             border: 1px solid #ddd;
             padding: 10px;
@@ -141,17 +289,6 @@ class ComprehensiveReportGenerator:
             margin: 15px 0;
         }
         
-        .brand-list {
-            columns: 2;
-            column-gap: 20px;
-            margin: 15px 0;
-        }
-        
-        .brand-list li {
-            break-inside: avoid;
-            margin-bottom: 5px;
-        }
-        
         .chart-container {
             text-align: center;
             margin: 20px 0;
@@ -161,144 +298,220 @@ class ComprehensiveReportGenerator:
             max-width: 100%;
             height: auto;
         }
-        """
+        """)
+
+@lru_cache(maxsize=None)
+def _weasyprint():
+    """(HTML, parsed stylesheet, font configuration), set up on the first PDF render; None without WeasyPrint"""
+    # Deferred so callers that never render a PDF skip loading Cairo/Pango
+    try:
+        from weasyprint import HTML, CSS
+        from weasyprint.text.fonts import FontConfiguration
+    except ImportError:
+        return None
+    # One FontConfiguration keeps fontconfig's font lookup warm across renders
+    font_config = FontConfiguration()
+    return HTML, CSS(string=_CSS_STYLES, font_config=font_config), font_config
+
+def _with_inline_css(html_content: str) -> str:
+    """Embed the report stylesheet in HTML rendered without one"""
+    if '<style>' in html_content:
+        return html_content
+    return html_content.replace('</head>', f'<style>{_CSS_STYLES}</style>\n        </head>', 1)
+
+# (metric name, yfinance info key) pairs read by calculate_financial_metrics
+_METRIC_MAP = (
+    ('market_cap', 'marketCap'),
+    ('pe_ratio', 'trailingPE'),
+    ('pb_ratio', 'priceToBook'),
+    ('roe', 'returnOnEquity'),
+    ('roa', 'returnOnAssets'),
+    ('debt_to_equity', 'debtToEquity'),
+    ('current_ratio', 'currentRatio'),
+    ('profit_margin', 'profitMargins'),
+    ('revenue_growth', 'revenueGrowth'),
+    ('dividend_yield', 'dividendYield'),
+    ('beta', 'beta'),
+    ('book_value', 'bookValue'),
+    ('earnings_growth', 'earningsGrowth'),
+    ('gross_margins', 'grossMargins'),
+    ('operating_margins', 'operatingMargins'),
+    ('ebitda_margins', 'ebitdaMargins'),
+    ('quick_ratio', 'quickRatio'),
+    ('total_cash', 'totalCash'),
+    ('total_debt', 'totalDebt'),
+    ('revenue_per_share', 'revenuePerShare'),
+    ('forward_pe', 'forwardPE'),
+    ('peg_ratio', 'pegRatio'),
+    ('price_to_sales', 'priceToSalesTrailing12Months'),
+    ('enterprise_value', 'enterpriseValue'),
+    ('ev_revenue', 'enterpriseToRevenue'),
+    ('ev_ebitda', 'enterpriseToEbitda'),
+    ('fifty_two_week_high', 'fiftyTwoWeekHigh'),
+    ('fifty_two_week_low', 'fiftyTwoWeekLow'),
+    ('shares_outstanding', 'sharesOutstanding'),
+    ('float_shares', 'floatShares'),
+    ('held_percent_institutions', 'heldPercentInstitutions'),
+    ('held_percent_insiders', 'heldPercentInsiders'),
+    ('total_revenue', 'totalRevenue'),
+    ('total_assets', 'totalAssets'),
+    ('total_equity', 'totalStockholderEquity'),
+    ('current_price', 'currentPrice'),
+)
+
+# Secondary info keys tried when the primary one is missing or empty
+_METRIC_FALLBACKS = (
+    ('total_assets', 'totalAssetsTtm'),
+    ('total_equity', 'stockholdersEquity'),
+    ('current_price', 'regularMarketPrice'),
+)
+
+# Statement row-label keywords, most specific first
+_REVENUE_KEYWORDS = ('total revenue', 'revenue', 'net sales', 'sales')
+_INCOME_KEYWORDS = ('net income', 'net earnings', 'profit', 'earnings')
+
+def _keyword_row(rows: Dict[str, np.ndarray], keywords) -> Optional[np.ndarray]:
+    """First row whose label contains the first keyword that matches any row"""
+    for keyword in keywords:
+        for label, row in rows.items():
+            if keyword in label:
+                return row
+    return None
+
+def _row_billions(row: np.ndarray, count: int) -> np.ndarray:
+    """First count values of a statement row in billions, with gaps as 0"""
+    values = row[:count] / 1e9
+    return np.where(np.isnan(values), 0.0, values)
+
+def _recent_prices(closes: np.ndarray) -> Tuple[Any, Any, Any]:
+    """Last close plus the closes a quarter and a year back; None where history is too short"""
+    size = closes.size
+    if size == 0:
+        return None, None, None
+    quarter_ago = closes[-min(63, size)] if size > 60 else None
+    year_ago = closes[-min(252, size)] if size > 250 else None
+    return closes[-1], quarter_ago, year_ago
+
+def _pct(info: Dict, key: str) -> Any:
+    """Fraction under key as a percentage; 0 when it is missing, None or zero"""
+    value = info.get(key)
+    return value * 100 if value else 0
+
+def _remember(cache: Dict, key: Any, value: Any, limit: int) -> None:
+    """Store value under key, evicting the oldest entry once the cache holds limit items"""
+    if key not in cache and len(cache) >= limit:
+        cache.pop(next(iter(cache)), None)
+    cache[key] = value
+
+@dataclass
+class ReportContext:
+    """Company fields the report sections read, pulled out of a data bundle once per report"""
+    symbol: str
+    company_name: str
+    sector: Optional[str]
+    industry: Optional[str]
+    country: Optional[str]
+    website: Optional[str]
+    description: str
+    business_summary: str
+    employees: Optional[int]
+    current_price: float
+    market_cap: float
+    total_revenue: float
+    beta: float
+    pe_ratio: float
+    profit_margins: float  # percent
+    revenue_growth: float  # percent
+    debt_to_equity: float  # ratio, not percent
+    close_prices: np.ndarray
+    financial_rows: Dict[str, np.ndarray]
+    financial_years: List[Any]
     
-    def fetch_company_data(self, symbol: str) -> Dict[str, Any]:
-        """Fetch comprehensive company data from multiple sources"""
-        try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            hist = ticker.history(period="5y")
-            financials = ticker.financials
-            balance_sheet = ticker.balance_sheet
-            cash_flow = ticker.cashflow
-            
-            return {
-                'info': info,
-                'history': hist,
-                'financials': financials,
-                'balance_sheet': balance_sheet,
-                'cash_flow': cash_flow,
-                'symbol': symbol.upper()
-            }
-        except Exception as e:
-            print(f"Error fetching data for {symbol}: {e}")
-            return {'symbol': symbol.upper(), 'error': str(e)}
+    # Display strings shared by several sections, formatted once
+    market_cap_str: str = field(init=False)
+    market_cap_billions_str: str = field(init=False)
+    revenue_growth_str: str = field(init=False)
+    profit_margins_str: str = field(init=False)
     
-    def calculate_financial_metrics(self, data: Dict) -> Dict[str, Any]:
-        """Calculate comprehensive financial metrics and ratios"""
-        if 'error' in data:
-            return {}
-        
-        try:
-            info = data.get('info', {})
-            
-            # Basic metrics from info - handle both None and missing values
-            def safe_get(key, default=0):
-                value = info.get(key, default)
-                return value if value is not None else default
-            
-            metrics = {
-                'market_cap': safe_get('marketCap'),
-                'pe_ratio': safe_get('trailingPE'),
-                'pb_ratio': safe_get('priceToBook'),
-                'roe': safe_get('returnOnEquity'),
-                'roa': safe_get('returnOnAssets'),
-                'debt_to_equity': safe_get('debtToEquity'),
-                'current_ratio': safe_get('currentRatio'),
-                'profit_margin': safe_get('profitMargins'),
-                'revenue_growth': safe_get('revenueGrowth'),
-                'dividend_yield': safe_get('dividendYield'),
-                'beta': safe_get('beta'),
-                'book_value': safe_get('bookValue'),
-                'earnings_growth': safe_get('earningsGrowth'),
-                'gross_margins': safe_get('grossMargins'),
-                'operating_margins': safe_get('operatingMargins'),
-                'ebitda_margins': safe_get('ebitdaMargins'),
-                'quick_ratio': safe_get('quickRatio'),
-                'total_cash': safe_get('totalCash'),
-                'total_debt': safe_get('totalDebt'),
-                'revenue_per_share': safe_get('revenuePerShare'),
-                'forward_pe': safe_get('forwardPE'),
-                'peg_ratio': safe_get('pegRatio'),
-                'price_to_sales': safe_get('priceToSalesTrailing12Months'),
-                'enterprise_value': safe_get('enterpriseValue'),
-                'ev_revenue': safe_get('enterpriseToRevenue'),
-                'ev_ebitda': safe_get('enterpriseToEbitda'),
-                'fifty_two_week_high': safe_get('fiftyTwoWeekHigh'),
-                'fifty_two_week_low': safe_get('fiftyTwoWeekLow'),
-                'shares_outstanding': safe_get('sharesOutstanding'),
-                'float_shares': safe_get('floatShares'),
-                'held_percent_institutions': safe_get('heldPercentInstitutions'),
-                'held_percent_insiders': safe_get('heldPercentInsiders'),
-                'total_revenue': safe_get('totalRevenue'),
-                'total_assets': safe_get('totalAssets', safe_get('totalAssetsTtm')),
-                'total_equity': safe_get('totalStockholderEquity', safe_get('stockholdersEquity')),
-                'current_price': safe_get('currentPrice', safe_get('regularMarketPrice')),
-            }
-            
-            # Get current price from history if not in info
-            if metrics['current_price'] == 0:
-                hist = data.get('history')
-                if hist is not None and not hist.empty:
-                    metrics['current_price'] = float(hist['Close'].iloc[-1])
-            
-            # Calculate additional metrics with safety checks
-            if metrics['pe_ratio'] > 0 and metrics['earnings_growth'] > 0:
-                metrics['peg_calculated'] = metrics['pe_ratio'] / (metrics['earnings_growth'] * 100)
-            
-            # DuPont Analysis components with better data sourcing
-            if metrics['profit_margin'] > 0 and metrics['total_assets'] > 0 and metrics['total_equity'] > 0:
-                # Calculate asset turnover and equity multiplier
-                revenue = metrics['total_revenue']
-                if revenue > 0:
-                    asset_turnover = revenue / metrics['total_assets']
-                    equity_multiplier = metrics['total_assets'] / metrics['total_equity']
-                    
-                    metrics['dupont'] = {
-                        'net_profit_margin': metrics['profit_margin'],
-                        'asset_turnover': asset_turnover,
-                        'equity_multiplier': equity_multiplier,
-                        'roe_calculated': metrics['profit_margin'] * asset_turnover * equity_multiplier
-                    }
-                else:
-                    # Fallback DuPont calculation using available ROE
-                    if metrics['roe'] > 0:
-                        metrics['dupont'] = {
-                            'net_profit_margin': metrics['profit_margin'],
-                            'asset_turnover': 1.0,  # Estimate
-                            'equity_multiplier': metrics['total_assets'] / metrics['total_equity'] if metrics['total_equity'] > 0 else 1.0,
-                            'roe_calculated': metrics['roe']
-                        }
-            
-            # If no DuPont data but we have ROE, create a simplified version
-            if 'dupont' not in metrics and metrics['roe'] > 0:
-                metrics['dupont'] = {
-                    'net_profit_margin': metrics['profit_margin'],
-                    'asset_turnover': 1.0,
-                    'equity_multiplier': 1.0,
-                    'roe_calculated': metrics['roe']
-                }
-            
-            return metrics
-            
-        except Exception as e:
-            print(f"Error calculating financial metrics: {e}")
-            return {}
+    def __post_init__(self):
+        self.market_cap_str = f"{self.market_cap:,.0f}"
+        self.market_cap_billions_str = f"{self.market_cap / 1000000000:.1f}"
+        self.revenue_growth_str = f"{self.revenue_growth:+.1f}"
+        self.profit_margins_str = f"{self.profit_margins:.1f}"
     
-    def generate_header_section(self, data: Dict) -> str:
-        """Generate report header with company information"""
+    @classmethod
+    def from_data(cls, data: Dict) -> 'ReportContext':
+        """Build the context from a fetch_company_data result"""
         info = data.get('info', {})
         symbol = data.get('symbol', 'N/A')
         
-        company_name = info.get('longName', symbol)
-        sector = info.get('sector', 'N/A')
-        industry = info.get('industry', 'N/A')
+        beta = info.get('beta')
+        pe_ratio = info.get('forwardPE')
+        if pe_ratio is None:
+            pe_ratio = info.get('trailingPE') or 0
+        debt_to_equity = info.get('debtToEquity')
         
-        current_price = info.get('currentPrice', 0)
-        target_price = current_price * 1.15  # 15% upside assumption
-        
-        return f"""
+        return cls(
+            symbol=symbol,
+            company_name=info.get('longName') or symbol,
+            sector=info.get('sector'),
+            industry=info.get('industry'),
+            country=info.get('country'),
+            website=info.get('website'),
+            description=info.get('longBusinessSummary') or 'No business description available.',
+            business_summary=info.get('businessSummary') or 'Business summary not available.',
+            employees=info.get('fullTimeEmployees'),
+            current_price=info.get('currentPrice') or 0,
+            market_cap=info.get('marketCap') or 0,
+            total_revenue=info.get('totalRevenue') or 0,
+            beta=1.0 if beta is None else beta,
+            pe_ratio=pe_ratio,
+            profit_margins=_pct(info, 'profitMargins'),
+            revenue_growth=_pct(info, 'revenueGrowth'),
+            debt_to_equity=debt_to_equity / 100 if debt_to_equity else 0,
+            close_prices=data.get('close_prices', np.empty(0, dtype=np.float32)),
+            financial_rows=data.get('financial_rows', {}),
+            financial_years=data.get('financial_years', []),
+        )
+
+@dataclass
+class Report:
+    """Report HTML, with the PDF rendered on the first read of .pdf and kept"""
+    symbol: str
+    html: str
+    generator: 'ComprehensiveReportGenerator' = field(repr=False)
+    _pdf: Optional[bytes] = field(default=None, init=False, repr=False)
+    
+    @property
+    def pdf(self) -> Optional[bytes]:
+        """PDF bytes, or the styled HTML as bytes when WeasyPrint is unavailable"""
+        if self._pdf is None:
+            self._pdf = self.generator.generate_pdf_bytes(self.html)
+        return self._pdf
+
+class ComprehensiveReportGenerator:
+    css_styles = _CSS_STYLES
+    METRICS_CACHE_SIZE = 256
+    REPORT_CACHE_SIZE = 64
+    
+    # Section skeletons, built once and filled per report with str.format_map
+    _TPL_PAGE_HEAD = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <title>Educational Equity Research Report - {symbol}</title>
+            {style}
+        </head>
+        <body>
+            """
+    
+    _PAGE_FOOT = """
+        </body>
+        </html>
+        """
+    
+    _TPL_HEADER = """
         <div class="header">
             <div class="company-name">{company_name}</div>
             <div class="sector-info">
@@ -316,16 +529,7 @@ class ComprehensiveReportGenerator:
         </div>
         """
     
-    def generate_business_overview(self, data: Dict) -> str:
-        """Generate business overview section"""
-        info = data.get('info', {})
-        
-        description = info.get('longBusinessSummary', 'No business description available.')
-        website = info.get('website', '')
-        employees = info.get('fullTimeEmployees', 0)
-        founded = info.get('foundedYear', 'N/A')
-        
-        return f"""
+    _TPL_BUSINESS_OVERVIEW = """
         <div class="section-title">2. About the Business</div>
         <p><strong>Business Description:</strong></p>
         <p>{description}</p>
@@ -342,345 +546,156 @@ class ComprehensiveReportGenerator:
         </div>
         """
     
-    def generate_financial_snapshot(self, data: Dict, metrics: Dict) -> str:
-        """Generate 4-year financial snapshot with projections"""
-        try:
-            financials = data.get('financials', pd.DataFrame())
-            info = data.get('info', {})
-            
-            if financials.empty:
-                # Use available info data to create a basic financial snapshot
-                revenue = metrics.get('total_revenue', 0)
-                market_cap = metrics.get('market_cap', 0)
-                
-                if revenue > 0 or market_cap > 0:
-                    financial_table = f"""
-                    <div class="section-title">3. Financial Snapshot</div>
-                    <table class="financial-table">
-                        <tr><th>Metric</th><th>Current</th></tr>
-                        <tr><td><strong>Market Cap</strong></td><td>${market_cap/1e9:.2f}B</td></tr>
-                        <tr><td><strong>Total Revenue (TTM)</strong></td><td>${revenue/1e9:.2f}B</td></tr>
-                        <tr><td><strong>Net Profit Margin</strong></td><td>{(metrics.get('profit_margin', 0) * 100):.2f}%</td></tr>
-                        <tr><td><strong>Gross Margin</strong></td><td>{(metrics.get('gross_margins', 0) * 100):.2f}%</td></tr>
-                        <tr><td><strong>Operating Margin</strong></td><td>{(metrics.get('operating_margins', 0) * 100):.2f}%</td></tr>
-                    </table>
-                    """
-                else:
-                    financial_table = """
-                    <div class="section-title">3. Financial Snapshot</div>
-                    <p>Detailed historical financial data is not available. Current market metrics are shown in other sections.</p>
-                    """
-            else:
-                # Process available financial data
-                years = financials.columns[:4] if len(financials.columns) >= 4 else financials.columns
-                
-                # Try to find revenue data with multiple possible names
-                revenue_row = None
-                revenue_keywords = ['Total Revenue', 'Revenue', 'Net Sales', 'Sales']
-                for keyword in revenue_keywords:
-                    revenue_row = financials.loc[financials.index.str.contains(keyword, case=False, na=False)]
-                    if not revenue_row.empty:
-                        break
-                
-                # Try to find net income data
-                net_income_row = None
-                income_keywords = ['Net Income', 'Net Earnings', 'Profit', 'Earnings']
-                for keyword in income_keywords:
-                    net_income_row = financials.loc[financials.index.str.contains(keyword, case=False, na=False)]
-                    if not net_income_row.empty:
-                        break
-                
-                financial_table = """
-                <div class="section-title">3. Financial Snapshot (Last 4 Years + Projections)</div>
-                <table class="financial-table">
-                    <tr><th>Metric</th>
-                """
-                
-                for year in years:
-                    financial_table += f"<th>{year.strftime('%Y')}</th>"
-                
-                financial_table += "<th>Projected</th></tr>"
-                
-                # Add revenue row if available
-                if revenue_row is not None and not revenue_row.empty:
-                    financial_table += "<tr><td><strong>Revenue ($ Billions)</strong></td>"
-                    revenue_values = []
-                    for year in years:
-                        value = revenue_row.iloc[0][year] / 1e9 if not pd.isna(revenue_row.iloc[0][year]) else 0
-                        revenue_values.append(value)
-                        financial_table += f"<td>${value:,.1f}B</td>"
-                    
-                    # Simple projection
-                    if len(revenue_values) >= 2 and revenue_values[1] != 0:
-                        growth_rate = (revenue_values[0] - revenue_values[1]) / revenue_values[1]
-                        projected = revenue_values[0] * (1 + max(growth_rate, -0.2))  # Cap negative growth
-                        financial_table += f"<td>${projected:,.1f}B</td>"
-                    else:
-                        financial_table += "<td>N/A</td>"
-                    financial_table += "</tr>"
-                
-                # Add net income row if available
-                if net_income_row is not None and not net_income_row.empty:
-                    financial_table += "<tr><td><strong>Net Income ($ Billions)</strong></td>"
-                    for year in years:
-                        value = net_income_row.iloc[0][year] / 1e9 if not pd.isna(net_income_row.iloc[0][year]) else 0
-                        financial_table += f"<td>${value:,.1f}B</td>"
-                    financial_table += "<td>N/A</td></tr>"
-                
-                # Add current metrics
-                financial_table += f"""
-                    <tr><td><strong>Net Profit Margin</strong></td>
-                        <td colspan="5">{(metrics.get('profit_margin', 0) * 100):.2f}%</td></tr>
-                    <tr><td><strong>Gross Margin</strong></td>
-                        <td colspan="5">{(metrics.get('gross_margins', 0) * 100):.2f}%</td></tr>
-                """
-                
-                financial_table += "</table>"
-            
-            # Shareholding pattern
-            held_institutions = metrics.get('held_percent_institutions', 0) * 100
-            held_insiders = metrics.get('held_percent_insiders', 0) * 100
-            public_holding = max(0, 100 - held_institutions - held_insiders)
-            
-            shareholding_section = f"""
-            <h4>Shareholding Pattern</h4>
-            <div class="metric-grid">
-                <div class="metric-box">
-                    <div class="metric-label">Institutional Holdings</div>
-                    <div class="metric-value">{held_institutions:.1f}%</div>
-                </div>
-                <div class="metric-box">
-                    <div class="metric-label">Insider Holdings</div>
-                    <div class="metric-value">{held_insiders:.1f}%</div>
-                </div>
-            </div>
-            <div class="metric-grid">
-                <div class="metric-box">
-                    <div class="metric-label">Public Holdings</div>
-                    <div class="metric-value">{public_holding:.1f}%</div>
-                </div>
-                <div class="metric-box">
-                    <div class="metric-label">Shares Outstanding</div>
-                    <div class="metric-value">{metrics.get('shares_outstanding', 0)/1e6:.0f}M</div>
-                </div>
-            </div>
-            """
-            
-            return financial_table + shareholding_section
-            
-        except Exception as e:
-            print(f"Error generating financial snapshot: {e}")
-            return f"""
-            <div class="section-title">3. Financial Snapshot</div>
-            <p>Error processing financial data: {str(e)}</p>
-            <p>Current market cap: ${metrics.get('market_cap', 0)/1e9:.2f}B</p>
-            <p>Current price: ${metrics.get('current_price', 0):.2f}</p>
-            """
-    
-    def generate_key_metrics(self, metrics: Dict) -> str:
-        """Generate key financial metrics section"""
-        return f"""
+    _TPL_KEY_METRICS = """
         <div class="section-title">4. Key Financial Metrics</div>
         <div class="metric-grid">
             <div class="metric-box">
                 <div class="metric-label">Return on Equity (ROE)</div>
-                <div class="metric-value">{(metrics.get('roe', 0) * 100):.2f}%</div>
+                <div class="metric-value">{roe:.2f}%</div>
             </div>
             <div class="metric-box">
                 <div class="metric-label">Return on Assets (ROA)</div>
-                <div class="metric-value">{(metrics.get('roce', 0) * 100):.2f}%</div>
+                <div class="metric-value">{roce:.2f}%</div>
             </div>
             <div class="metric-box">
                 <div class="metric-label">Gross Profit Margin</div>
-                <div class="metric-value">{(metrics.get('gross_margins', 0) * 100):.2f}%</div>
+                <div class="metric-value">{gross_margins:.2f}%</div>
             </div>
             <div class="metric-box">
                 <div class="metric-label">Operating Margin</div>
-                <div class="metric-value">{(metrics.get('operating_margins', 0) * 100):.2f}%</div>
+                <div class="metric-value">{operating_margins:.2f}%</div>
             </div>
             <div class="metric-box">
                 <div class="metric-label">EBITDA Margin</div>
-                <div class="metric-value">{(metrics.get('ebitda_margins', 0) * 100):.2f}%</div>
+                <div class="metric-value">{ebitda_margins:.2f}%</div>
             </div>
             <div class="metric-box">
                 <div class="metric-label">Dividend Yield</div>
-                <div class="metric-value">{(metrics.get('dividend_yield', 0) * 100):.2f}%</div>
+                <div class="metric-value">{dividend_yield:.2f}%</div>
             </div>
         </div>
         """
     
-    def generate_ratios_table(self, metrics: Dict) -> str:
-        """Generate comprehensive financial ratios table"""
-        
-        def format_ratio(value, is_percentage=False, decimal_places=2):
-            """Format ratio values safely"""
-            if value is None or value == 0:
-                return "N/A"
-            try:
-                if is_percentage:
-                    return f"{float(value * 100):.{decimal_places}f}%"
-                else:
-                    return f"{float(value):.{decimal_places}f}"
-            except (ValueError, TypeError):
-                return "N/A"
-        
-        return f"""
+    _TPL_RATIOS = """
         <div class="section-title">10. Financial Ratios Table</div>
         <table class="financial-table">
             <tr><th colspan="2">Valuation Ratios</th></tr>
-            <tr><td>Price-to-Earnings (P/E)</td><td>{format_ratio(metrics.get('pe_ratio'))}</td></tr>
-            <tr><td>Price-to-Book (P/B)</td><td>{format_ratio(metrics.get('pb_ratio'))}</td></tr>
-            <tr><td>EV/EBITDA</td><td>{format_ratio(metrics.get('ev_ebitda'))}</td></tr>
-            <tr><td>Price-to-Sales</td><td>{format_ratio(metrics.get('price_to_sales'))}</td></tr>
-            <tr><td>PEG Ratio</td><td>{format_ratio(metrics.get('peg_ratio'))}</td></tr>
-            <tr><td>Forward P/E</td><td>{format_ratio(metrics.get('forward_pe'))}</td></tr>
+            <tr><td>Price-to-Earnings (P/E)</td><td>{pe_ratio}</td></tr>
+            <tr><td>Price-to-Book (P/B)</td><td>{pb_ratio}</td></tr>
+            <tr><td>EV/EBITDA</td><td>{ev_ebitda}</td></tr>
+            <tr><td>Price-to-Sales</td><td>{price_to_sales}</td></tr>
+            <tr><td>PEG Ratio</td><td>{peg_ratio}</td></tr>
+            <tr><td>Forward P/E</td><td>{forward_pe}</td></tr>
             
             <tr><th colspan="2">Liquidity Ratios</th></tr>
-            <tr><td>Current Ratio</td><td>{format_ratio(metrics.get('current_ratio'))}</td></tr>
-            <tr><td>Quick Ratio</td><td>{format_ratio(metrics.get('quick_ratio'))}</td></tr>
+            <tr><td>Current Ratio</td><td>{current_ratio}</td></tr>
+            <tr><td>Quick Ratio</td><td>{quick_ratio}</td></tr>
             
             <tr><th colspan="2">Solvency Ratios</th></tr>
-            <tr><td>Debt-to-Equity</td><td>{format_ratio(metrics.get('debt_to_equity'))}</td></tr>
-            <tr><td>Beta</td><td>{format_ratio(metrics.get('beta'))}</td></tr>
+            <tr><td>Debt-to-Equity</td><td>{debt_to_equity}</td></tr>
+            <tr><td>Beta</td><td>{beta}</td></tr>
             
             <tr><th colspan="2">Profitability Ratios</th></tr>
-            <tr><td>Gross Profit Margin</td><td>{format_ratio(metrics.get('gross_margins'), True)}</td></tr>
-            <tr><td>Operating Margin</td><td>{format_ratio(metrics.get('operating_margins'), True)}</td></tr>
-            <tr><td>EBITDA Margin</td><td>{format_ratio(metrics.get('ebitda_margins'), True)}</td></tr>
-            <tr><td>Net Profit Margin</td><td>{format_ratio(metrics.get('profit_margin'), True)}</td></tr>
+            <tr><td>Gross Profit Margin</td><td>{gross_margins}</td></tr>
+            <tr><td>Operating Margin</td><td>{operating_margins}</td></tr>
+            <tr><td>EBITDA Margin</td><td>{ebitda_margins}</td></tr>
+            <tr><td>Net Profit Margin</td><td>{profit_margin}</td></tr>
             
             <tr><th colspan="2">Return Ratios</th></tr>
-            <tr><td>Return on Assets (ROA)</td><td>{format_ratio(metrics.get('roa'), True)}</td></tr>
-            <tr><td>Return on Equity (ROE)</td><td>{format_ratio(metrics.get('roe'), True)}</td></tr>
+            <tr><td>Return on Assets (ROA)</td><td>{roa}</td></tr>
+            <tr><td>Return on Equity (ROE)</td><td>{roe}</td></tr>
             
             <tr><th colspan="2">Growth & Yield</th></tr>
-            <tr><td>Revenue Growth</td><td>{format_ratio(metrics.get('revenue_growth'), True)}</td></tr>
-            <tr><td>Earnings Growth</td><td>{format_ratio(metrics.get('earnings_growth'), True)}</td></tr>
-            <tr><td>Dividend Yield</td><td>{format_ratio(metrics.get('dividend_yield'), True)}</td></tr>
+            <tr><td>Revenue Growth</td><td>{revenue_growth}</td></tr>
+            <tr><td>Earnings Growth</td><td>{earnings_growth}</td></tr>
+            <tr><td>Dividend Yield</td><td>{dividend_yield}</td></tr>
             
             <tr><th colspan="2">Market Data</th></tr>
-            <tr><td>52-Week High</td><td>${format_ratio(metrics.get('fifty_two_week_high'))}</td></tr>
-            <tr><td>52-Week Low</td><td>${format_ratio(metrics.get('fifty_two_week_low'))}</td></tr>
-            <tr><td>Current Price</td><td>${format_ratio(metrics.get('current_price'))}</td></tr>
+            <tr><td>52-Week High</td><td>${fifty_two_week_high}</td></tr>
+            <tr><td>52-Week Low</td><td>${fifty_two_week_low}</td></tr>
+            <tr><td>Current Price</td><td>${current_price}</td></tr>
         </table>
         """
     
-    def generate_dupont_analysis(self, metrics: Dict) -> str:
-        """Generate DuPont analysis section"""
-        dupont = metrics.get('dupont', {})
-        
-        if not dupont and metrics.get('roe', 0) > 0:
-            # Create a simplified DuPont analysis if we have ROE
-            dupont = {
-                'net_profit_margin': metrics.get('profit_margin', 0),
-                'asset_turnover': 1.0,  # Placeholder
-                'equity_multiplier': 1.0 + (metrics.get('debt_to_equity', 0) / 100),  # Approximation
-                'roe_calculated': metrics.get('roe', 0)
-            }
-        
-        if not dupont:
-            return """
-            <div class="section-title">11. DuPont Analysis</div>
-            <div class="dupont-analysis">
-                <p>DuPont analysis requires detailed financial statement data that is not currently available.</p>
-                <p>This analysis decomposes Return on Equity (ROE) into three components:</p>
-                <ul>
-                    <li><strong>Net Profit Margin:</strong> Measures operational efficiency</li>
-                    <li><strong>Asset Turnover:</strong> Measures asset utilization efficiency</li>
-                    <li><strong>Equity Multiplier:</strong> Measures financial leverage</li>
-                </ul>
-                <p>ROE = Net Profit Margin × Asset Turnover × Equity Multiplier</p>
-            </div>
-            """
-        
-        def safe_format(value, is_percentage=False):
-            if value is None or value == 0:
-                return "N/A"
-            try:
-                if is_percentage:
-                    return f"{float(value * 100):.2f}%"
-                else:
-                    return f"{float(value):.3f}"
-            except (ValueError, TypeError):
-                return "N/A"
-        
-        npm = dupont.get('net_profit_margin', 0)
-        ato = dupont.get('asset_turnover', 0) 
-        em = dupont.get('equity_multiplier', 0)
-        roe_calc = dupont.get('roe_calculated', 0)
-        
-        return f"""
+    # Ratio fields shown as plain numbers and as percentages
+    _RATIO_KEYS = ('pe_ratio', 'pb_ratio', 'ev_ebitda', 'price_to_sales', 'peg_ratio', 'forward_pe',
+                   'current_ratio', 'quick_ratio', 'debt_to_equity', 'beta',
+                   'fifty_two_week_high', 'fifty_two_week_low', 'current_price')
+    _RATIO_PCT_KEYS = ('gross_margins', 'operating_margins', 'ebitda_margins', 'profit_margin',
+                       'roa', 'roe', 'revenue_growth', 'earnings_growth', 'dividend_yield')
+    _RATIO_FIELDS = _RATIO_KEYS + _RATIO_PCT_KEYS
+    _RATIO_SCALE = np.array([1.0] * len(_RATIO_KEYS) + [100.0] * len(_RATIO_PCT_KEYS))
+    _RATIO_SUFFIX = np.array([''] * len(_RATIO_KEYS) + ['%'] * len(_RATIO_PCT_KEYS))
+    
+    _TPL_DUPONT = """
         <div class="section-title">11. DuPont Analysis</div>
         <div class="dupont-analysis">
             <p><strong>ROE Decomposition:</strong></p>
             <p>ROE = Net Profit Margin × Asset Turnover × Equity Multiplier</p>
-            <p>ROE = {safe_format(npm, True)} × {safe_format(ato)} × {safe_format(em)}</p>
-            <p><strong>Calculated ROE = {safe_format(roe_calc, True)}</strong></p>
-            <p><strong>Reported ROE = {safe_format(metrics.get('roe'), True)}</strong></p>
+            <p>ROE = {npm_s} × {ato_s} × {em_s}</p>
+            <p><strong>Calculated ROE = {roe_calculated}</strong></p>
+            <p><strong>Reported ROE = {roe_reported}</strong></p>
             
             <h4>Component Analysis:</h4>
             <div class="metric-grid">
                 <div class="metric-box">
                     <div class="metric-label">Net Profit Margin</div>
-                    <div class="metric-value">{safe_format(npm, True)}</div>
+                    <div class="metric-value">{npm_s}</div>
                     <div style="font-size: 10px; color: #666;">Operational efficiency</div>
                 </div>
                 <div class="metric-box">
                     <div class="metric-label">Asset Turnover</div>
-                    <div class="metric-value">{safe_format(ato)}x</div>
+                    <div class="metric-value">{ato_s}x</div>
                     <div style="font-size: 10px; color: #666;">Asset utilization</div>
                 </div>
             </div>
             <div class="metric-grid">
                 <div class="metric-box">
                     <div class="metric-label">Equity Multiplier</div>
-                    <div class="metric-value">{safe_format(em)}x</div>
+                    <div class="metric-value">{em_s}x</div>
                     <div style="font-size: 10px; color: #666;">Financial leverage</div>
                 </div>
                 <div class="metric-box">
                     <div class="metric-label">Debt-to-Equity</div>
-                    <div class="metric-value">{safe_format(metrics.get('debt_to_equity'))}</div>
+                    <div class="metric-value">{debt_to_equity}</div>
                     <div style="font-size: 10px; color: #666;">Leverage ratio</div>
                 </div>
             </div>
             
             <h4>Interpretation:</h4>
             <ul>
-                <li><strong>Net Profit Margin ({safe_format(npm, True)}):</strong> 
-                    {'Excellent' if npm > 0.15 else 'Good' if npm > 0.08 else 'Moderate' if npm > 0.03 else 'Low'} operational efficiency</li>
-                <li><strong>Asset Turnover ({safe_format(ato)}x):</strong> 
-                    {'High' if ato > 1.5 else 'Moderate' if ato > 0.8 else 'Low'} asset utilization</li>
-                <li><strong>Equity Multiplier ({safe_format(em)}x):</strong> 
-                    {'High' if em > 3 else 'Moderate' if em > 1.5 else 'Conservative'} financial leverage</li>
+                <li><strong>Net Profit Margin ({npm_s}):</strong> 
+                    {npm_assessment} operational efficiency</li>
+                <li><strong>Asset Turnover ({ato_s}x):</strong> 
+                    {ato_assessment} asset utilization</li>
+                <li><strong>Equity Multiplier ({em_s}x):</strong> 
+                    {em_assessment} financial leverage</li>
             </ul>
         </div>
         """
     
-    def generate_industry_overview(self, data: Dict) -> str:
-        """Generate industry overview section with real data analysis"""
-        info = data.get('info', {})
-        sector = info.get('sector', 'N/A')
-        industry = info.get('industry', 'N/A')
-        symbol = data.get('symbol', 'N/A')
-        
-        # Get key financial metrics for competitive analysis
-        market_cap = info.get('marketCap', 0)
-        beta = info.get('beta', 1.0)
-        pe_ratio = info.get('forwardPE', info.get('trailingPE', 0))
-        roe = info.get('returnOnEquity', 0) * 100 if info.get('returnOnEquity') else 0
-        profit_margins = info.get('profitMargins', 0) * 100 if info.get('profitMargins') else 0
-        
-        # Determine competitive position based on metrics
-        competitive_position = "strong" if market_cap > 100000000000 and profit_margins > 15 else "moderate" if market_cap > 10000000000 else "developing"
-        
-        return f"""
+    _DUPONT_UNAVAILABLE = """
+            <div class="section-title">11. DuPont Analysis</div>
+            <div class="dupont-analysis">
+                <p>DuPont analysis requires detailed financial statement data that is not currently available.</p>
+                <p>This analysis decomposes Return on Equity (ROE) into three components:</p>
+                <ul>
+                    <li><strong>Net Profit Margin:</strong> Measures operational efficiency</li>
+                    <li><strong>Asset Turnover:</strong> Measures asset utilization efficiency</li>
+                    <li><strong>Equity Multiplier:</strong> Measures financial leverage</li>
+                </ul>
+                <p>ROE = Net Profit Margin × Asset Turnover × Equity Multiplier</p>
+            </div>
+            """
+    
+    _TPL_INDUSTRY = """
         <div class="section-title">7. Industry Overview</div>
         <div class="content">
             <p><strong>Sector Analysis:</strong> {sector}</p>
             <p><strong>Industry Classification:</strong> {industry}</p>
             
             <p><strong>Market Position Analysis:</strong></p>
-            <p>{symbol} operates within the {sector.lower()} sector, specifically in the {industry.lower()} industry. 
+            <p>{symbol} operates within the {sector_lower} sector, specifically in the {industry_lower} industry. 
             Based on financial metrics, the company maintains a {competitive_position} competitive position in its market segment.</p>
             
             <h4>Competitive Metrics Analysis:</h4>
@@ -692,39 +707,37 @@ class ComprehensiveReportGenerator:
                 </tr>
                 <tr>
                     <td>Market Capitalization</td>
-                    <td>${market_cap:,.0f}</td>
-                    <td>{"Large-cap leader" if market_cap > 200000000000 else "Mid-to-large cap player" if market_cap > 50000000000 else "Mid-cap participant"}</td>
+                    <td>${market_cap_str}</td>
+                    <td>{size_assessment}</td>
                 </tr>
                 <tr>
                     <td>Beta (Market Sensitivity)</td>
                     <td>{beta:.2f}</td>
-                    <td>{"Higher volatility than market" if beta > 1.2 else "Market-aligned volatility" if beta > 0.8 else "Lower volatility than market"}</td>
+                    <td>{beta_assessment}</td>
                 </tr>
                 <tr>
                     <td>P/E Ratio</td>
                     <td>{pe_ratio:.1f}x</td>
-                    <td>{"Premium valuation" if pe_ratio > 25 else "Market valuation" if pe_ratio > 15 else "Value pricing"}</td>
+                    <td>{pe_assessment}</td>
                 </tr>
                 <tr>
                     <td>Profit Margins</td>
-                    <td>{profit_margins:.1f}%</td>
-                    <td>{"Superior profitability" if profit_margins > 20 else "Strong margins" if profit_margins > 10 else "Moderate profitability"}</td>
+                    <td>{profit_margins_str}%</td>
+                    <td>{margin_assessment}</td>
                 </tr>
             </table>
             
             <h4>Competitive Advantages:</h4>
             <ul>
-                <li><strong>Scale Advantage:</strong> {"Significant market presence" if market_cap > 100000000000 else "Established market position" if market_cap > 10000000000 else "Growing market presence"} with ${market_cap/1000000000:.1f}B market cap</li>
-                <li><strong>Operational Efficiency:</strong> {profit_margins:.1f}% profit margins {"demonstrate strong operational control" if profit_margins > 15 else "indicate solid management execution" if profit_margins > 5 else "show room for improvement"}</li>
-                <li><strong>Financial Stability:</strong> {"Lower market sensitivity" if beta < 1.0 else "Market-correlated performance" if beta < 1.3 else "Higher growth/risk profile"} (Beta: {beta:.2f})</li>
-                <li><strong>Valuation Position:</strong> {"Premium market positioning" if pe_ratio > 25 else "Balanced valuation metrics" if pe_ratio > 10 else "Value-oriented pricing"} with {pe_ratio:.1f}x P/E ratio</li>
+                <li><strong>Scale Advantage:</strong> {scale_advantage} with ${market_cap_billions_str}B market cap</li>
+                <li><strong>Operational Efficiency:</strong> {profit_margins_str}% profit margins {efficiency_note}</li>
+                <li><strong>Financial Stability:</strong> {stability_note} (Beta: {beta:.2f})</li>
+                <li><strong>Valuation Position:</strong> {valuation_note} with {pe_ratio:.1f}x P/E ratio</li>
             </ul>
         </div>
         """
     
-    def generate_disclaimer(self) -> str:
-        """Generate comprehensive disclaimer"""
-        return """
+    _TPL_DISCLAIMER = """
         <div class="section-title">13. Disclaimer</div>
         <div class="disclaimer">
             <p><strong>EDUCATIONAL PURPOSE ONLY</strong></p>
@@ -741,85 +754,39 @@ class ComprehensiveReportGenerator:
             </ul>
             
             <p><strong>Prepared by:</strong> Student/Research Analyst for Academic Purposes</p>
-            <p><strong>Date:</strong> {datetime.now().strftime('%B %d, %Y')}</p>
+            <p><strong>Date:</strong> {date}</p>
         </div>
         """
     
-    def generate_strategic_highlights(self, data: Dict) -> str:
-        """Generate strategic highlights based on actual company data"""
-        info = data.get('info', {})
-        symbol = data.get('symbol', 'N/A')
-        
-        # Extract business description and strategy insights
-        business_summary = info.get('businessSummary', 'Business summary not available.')
-        market_cap = info.get('marketCap', 0)
-        employee_count = info.get('fullTimeEmployees', 'N/A')
-        
-        # Calculate company size classification
-        if market_cap > 200000000000:  # $200B+
-            size_class = "large-cap multinational corporation"
-        elif market_cap > 10000000000:  # $10B+
-            size_class = "mid-to-large cap company"
-        else:
-            size_class = "mid-cap company"
-        
-        # Get recent performance metrics
-        hist = data.get('history', pd.DataFrame())
-        price_change_52w = 0
-        if not hist.empty and len(hist) > 250:
-            current_price = hist['Close'].iloc[-1]
-            price_52w_ago = hist['Close'].iloc[-252]
-            price_change_52w = ((current_price - price_52w_ago) / price_52w_ago) * 100
-        
-        return f"""
+    _TPL_STRATEGIC = """
         <div class="section-title">5. Strategic Highlights</div>
         <div class="content">
             <p><strong>Business Strategy Overview:</strong></p>
-            <p>{business_summary[:500]}{"..." if len(business_summary) > 500 else ""}</p>
+            <p>{business_summary}</p>
             
             <p><strong>Key Strategic Metrics:</strong></p>
             <ul>
-                <li><strong>Market Position:</strong> {symbol} operates as a {size_class} with a market capitalization of ${market_cap:,.0f} million</li>
-                <li><strong>Workforce:</strong> Employs approximately {employee_count:,} full-time employees globally</li>
-                <li><strong>52-Week Performance:</strong> Stock has {"gained" if price_change_52w > 0 else "declined"} {abs(price_change_52w):.1f}% over the past year</li>
-                <li><strong>Sector Focus:</strong> Operates primarily in {info.get('sector', 'Multiple sectors')} with focus on {info.get('industry', 'diversified operations')}</li>
+                <li><strong>Market Position:</strong> {symbol} operates as a {size_class} with a market capitalization of ${market_cap_str} million</li>
+                <li><strong>Workforce:</strong> Employs approximately {employee_count} full-time employees globally</li>
+                <li><strong>52-Week Performance:</strong> Stock has {price_direction} {price_change_abs:.1f}% over the past year</li>
+                <li><strong>Sector Focus:</strong> Operates primarily in {sector} with focus on {industry}</li>
             </ul>
             
             <p><strong>Growth Initiatives:</strong></p>
-            <p>Based on financial metrics and market position, {symbol} appears focused on {"growth and expansion" if price_change_52w > 10 else "operational efficiency and market consolidation" if price_change_52w > -10 else "restructuring and recovery"}. 
-            The company's {"strong" if market_cap > 50000000000 else "stable"} market capitalization suggests {"continued investment in innovation and market expansion" if market_cap > 100000000000 else "focus on core business optimization"}.</p>
+            <p>Based on financial metrics and market position, {symbol} appears focused on {growth_focus}. 
+            The company's {cap_strength} market capitalization suggests {cap_outlook}.</p>
         </div>
         """
-
-    def generate_quarterly_performance(self, data: Dict) -> str:
-        """Generate quarterly performance analysis from available data"""
-        info = data.get('info', {})
-        hist = data.get('history', pd.DataFrame())
-        symbol = data.get('symbol', 'N/A')
-        
-        # Get recent financial metrics
-        revenue = info.get('totalRevenue', 0)
-        revenue_growth = info.get('revenueGrowth', 0) * 100 if info.get('revenueGrowth') else 0
-        profit_margins = info.get('profitMargins', 0) * 100 if info.get('profitMargins') else 0
-        
-        # Calculate recent price performance
-        quarterly_performance = []
-        if not hist.empty and len(hist) > 60:
-            # Last 3 months performance
-            current_price = hist['Close'].iloc[-1]
-            q_ago_price = hist['Close'].iloc[-63] if len(hist) > 63 else hist['Close'].iloc[0]
-            q_performance = ((current_price - q_ago_price) / q_ago_price) * 100
-            quarterly_performance.append(f"Q4 2024: {q_performance:+.1f}%")
-        
-        return f"""
+    
+    _TPL_QUARTERLY = """
         <div class="section-title">6. Quarterly Performance</div>
         <div class="content">
             <p><strong>Recent Financial Performance:</strong></p>
             <ul>
                 <li><strong>Total Revenue:</strong> ${revenue:,.0f} million (TTM)</li>
-                <li><strong>Revenue Growth:</strong> {revenue_growth:+.1f}% year-over-year</li>
-                <li><strong>Profit Margins:</strong> {profit_margins:.1f}% net margin</li>
-                <li><strong>Stock Performance:</strong> {quarterly_performance[0] if quarterly_performance else "Data not available for quarterly comparison"}</li>
+                <li><strong>Revenue Growth:</strong> {revenue_growth_str}% year-over-year</li>
+                <li><strong>Profit Margins:</strong> {profit_margins_str}% net margin</li>
+                <li><strong>Stock Performance:</strong> {stock_performance}</li>
             </ul>
             
             <p><strong>Key Performance Indicators:</strong></p>
@@ -831,39 +798,28 @@ class ComprehensiveReportGenerator:
                 </tr>
                 <tr>
                     <td>Revenue Growth</td>
-                    <td>{revenue_growth:+.1f}%</td>
-                    <td>{"Strong growth trajectory" if revenue_growth > 10 else "Moderate growth" if revenue_growth > 0 else "Revenue challenges"}</td>
+                    <td>{revenue_growth_str}%</td>
+                    <td>{growth_assessment}</td>
                 </tr>
                 <tr>
                     <td>Profitability</td>
-                    <td>{profit_margins:.1f}%</td>
-                    <td>{"Highly profitable" if profit_margins > 15 else "Moderately profitable" if profit_margins > 5 else "Margin pressure"}</td>
+                    <td>{profit_margins_str}%</td>
+                    <td>{profit_assessment}</td>
                 </tr>
                 <tr>
                     <td>Market Performance</td>
-                    <td>{quarterly_performance[0] if quarterly_performance else "N/A"}</td>
-                    <td>{"Outperforming market" if quarterly_performance and float(quarterly_performance[0].split(":")[1].replace("%", "")) > 5 else "Market aligned performance"}</td>
+                    <td>{market_performance}</td>
+                    <td>{market_assessment}</td>
                 </tr>
             </table>
             
             <p><strong>Quarterly Trends Analysis:</strong></p>
-            <p>Based on available financial data, {symbol} demonstrates {"strong operational performance" if revenue_growth > 5 and profit_margins > 10 else "stable business fundamentals" if revenue_growth > 0 else "operational challenges requiring attention"}. 
-            The company's {"robust" if profit_margins > 15 else "adequate"} profit margins indicate {"efficient cost management and pricing power" if profit_margins > 10 else "reasonable operational efficiency"}.</p>
+            <p>Based on available financial data, {symbol} demonstrates {trend_summary}. 
+            The company's {margin_strength} profit margins indicate {margin_meaning}.</p>
         </div>
         """
-
-    def generate_brand_portfolio(self, data: Dict) -> str:
-        """Generate brand portfolio and geographic analysis"""
-        info = data.get('info', {})
-        symbol = data.get('symbol', 'N/A')
-        
-        # Extract available geographic and business data
-        country = info.get('country', 'United States')
-        sector = info.get('sector', 'Technology')
-        industry = info.get('industry', 'Software')
-        website = info.get('website', 'N/A')
-        
-        return f"""
+    
+    _TPL_BRAND_PORTFOLIO = """
         <div class="section-title">8. Brand Portfolio & Geographic Breakdown</div>
         <div class="content">
             <p><strong>Corporate Structure:</strong></p>
@@ -875,92 +831,50 @@ class ComprehensiveReportGenerator:
             </ul>
             
             <p><strong>Business Segments:</strong></p>
-            <p>As a {sector.lower()} company operating in the {industry.lower()} space, {symbol} likely operates through multiple business segments including:</p>
+            <p>As a {sector_lower} company operating in the {industry_lower} space, {symbol} likely operates through multiple business segments including:</p>
             <ul>
-                <li>Core {industry.lower()} operations and services</li>
+                <li>Core {industry_lower} operations and services</li>
                 <li>Research and development initiatives</li>
                 <li>Customer support and professional services</li>
                 <li>Strategic partnerships and licensing</li>
             </ul>
             
             <p><strong>Geographic Presence:</strong></p>
-            <p>Based in {country}, {symbol} operates {"globally" if country == "United States" else "regionally"} with significant market presence. 
-            The company's {sector.lower()} focus suggests {"international expansion opportunities" if country == "United States" else "strong domestic market position"} 
-            and {"diverse revenue streams across multiple geographies" if country == "United States" else "concentrated market exposure"}.</p>
+            <p>Based in {country}, {symbol} operates {reach} with significant market presence. 
+            The company's {sector_lower} focus suggests {expansion} 
+            and {revenue_mix}.</p>
             
             <p><strong>Brand Strategy:</strong></p>
-            <p>The company maintains its market position through {"innovation and technology leadership" if sector == "Technology" else "operational excellence and customer service" if sector == "Consumer Cyclical" else "strategic market positioning"} 
-            in the {industry.lower()} segment.</p>
+            <p>The company maintains its market position through {brand_strategy} 
+            in the {industry_lower} segment.</p>
         </div>
         """
-
-    def generate_management_commentary(self, data: Dict) -> str:
-        """Generate management commentary section"""
-        info = data.get('info', {})
-        symbol = data.get('symbol', 'N/A')
-        
-        # Extract key management metrics and data
-        market_cap = info.get('marketCap', 0)
-        revenue_growth = info.get('revenueGrowth', 0) * 100 if info.get('revenueGrowth') else 0
-        profit_margins = info.get('profitMargins', 0) * 100 if info.get('profitMargins') else 0
-        
-        return f"""
+    
+    _TPL_MANAGEMENT = """
         <div class="section-title">9. Management Commentary</div>
         <div class="content">
             <p><strong>Executive Leadership Assessment:</strong></p>
-            <p>Management has demonstrated {"strong strategic execution" if revenue_growth > 5 else "stable operational management" if revenue_growth >= 0 else "challenging period requiring strategic adjustments"} 
+            <p>Management has demonstrated {execution} 
             based on recent financial performance indicators.</p>
             
             <p><strong>Key Strategic Focus Areas:</strong></p>
             <ul>
-                <li><strong>Revenue Generation:</strong> {"Successful growth strategy" if revenue_growth > 10 else "Moderate growth focus" if revenue_growth > 0 else "Revenue optimization efforts"} with {revenue_growth:+.1f}% year-over-year growth</li>
-                <li><strong>Operational Efficiency:</strong> {"Strong margin management" if profit_margins > 15 else "Adequate cost control" if profit_margins > 5 else "Margin improvement initiatives"} achieving {profit_margins:.1f}% net margins</li>
-                <li><strong>Market Position:</strong> {"Market leadership" if market_cap > 100000000000 else "Strong market presence" if market_cap > 10000000000 else "Growing market position"} with ${market_cap/1000000000:.1f}B market capitalization</li>
+                <li><strong>Revenue Generation:</strong> {revenue_focus} with {revenue_growth_str}% year-over-year growth</li>
+                <li><strong>Operational Efficiency:</strong> {margin_focus} achieving {profit_margins_str}% net margins</li>
+                <li><strong>Market Position:</strong> {market_position} with ${market_cap_billions_str}B market capitalization</li>
             </ul>
             
             <p><strong>Strategic Outlook:</strong></p>
-            <p>Based on financial metrics and market position, management appears focused on {"aggressive expansion and innovation" if revenue_growth > 15 and profit_margins > 15 else "balanced growth and profitability" if revenue_growth > 5 and profit_margins > 10 else "operational optimization and efficiency improvements"}. 
-            The {"strong" if market_cap > 50000000000 else "solid"} market valuation suggests investor confidence in management's strategic direction.</p>
+            <p>Based on financial metrics and market position, management appears focused on {outlook}. 
+            The {valuation_strength} market valuation suggests investor confidence in management's strategic direction.</p>
             
             <p><strong>Risk Management:</strong></p>
-            <p>Management's approach to risk appears {"conservative and well-balanced" if profit_margins > 10 else "moderately aggressive" if revenue_growth > profit_margins else "focused on growth over short-term profitability"} 
+            <p>Management's approach to risk appears {risk_approach} 
             given the current balance between growth initiatives and profitability metrics.</p>
         </div>
         """
-
-    def generate_ratings_rationale(self, data: Dict) -> str:
-        """Generate ratings rationale section"""
-        info = data.get('info', {})
-        symbol = data.get('symbol', 'N/A')
-        
-        # Calculate key rating factors
-        market_cap = info.get('marketCap', 0)
-        revenue_growth = info.get('revenueGrowth', 0) * 100 if info.get('revenueGrowth') else 0
-        profit_margins = info.get('profitMargins', 0) * 100 if info.get('profitMargins') else 0
-        debt_to_equity = info.get('debtToEquity', 0) / 100 if info.get('debtToEquity') else 0
-        
-        # Calculate composite rating
-        rating_score = 0
-        if revenue_growth > 10: rating_score += 2
-        elif revenue_growth > 5: rating_score += 1
-        elif revenue_growth > 0: rating_score += 0.5
-        
-        if profit_margins > 15: rating_score += 2
-        elif profit_margins > 10: rating_score += 1.5
-        elif profit_margins > 5: rating_score += 1
-        
-        if debt_to_equity < 0.3: rating_score += 1
-        elif debt_to_equity < 0.6: rating_score += 0.5
-        
-        if market_cap > 100000000000: rating_score += 1
-        elif market_cap > 10000000000: rating_score += 0.5
-        
-        # Determine rating
-        if rating_score >= 5: rating = "BUY"
-        elif rating_score >= 3.5: rating = "HOLD"
-        else: rating = "SELL"
-        
-        return f"""
+    
+    _TPL_RATINGS = """
         <div class="section-title">12. Ratings Rationale</div>
         <div class="content">
             <p><strong>Investment Rating: {rating}</strong></p>
@@ -974,42 +888,635 @@ class ComprehensiveReportGenerator:
                 </tr>
                 <tr>
                     <td>Revenue Growth</td>
-                    <td>{2 if revenue_growth > 10 else 1 if revenue_growth > 5 else 0.5 if revenue_growth > 0 else 0}/2</td>
-                    <td>{revenue_growth:+.1f}% growth rate</td>
+                    <td>{growth_score}/2</td>
+                    <td>{revenue_growth_str}% growth rate</td>
                 </tr>
                 <tr>
                     <td>Profitability</td>
-                    <td>{2 if profit_margins > 15 else 1.5 if profit_margins > 10 else 1 if profit_margins > 5 else 0}/2</td>
-                    <td>{profit_margins:.1f}% net margins</td>
+                    <td>{margin_score}/2</td>
+                    <td>{profit_margins_str}% net margins</td>
                 </tr>
                 <tr>
                     <td>Financial Strength</td>
-                    <td>{1 if debt_to_equity < 0.3 else 0.5 if debt_to_equity < 0.6 else 0}/1</td>
+                    <td>{leverage_score}/1</td>
                     <td>Debt-to-equity: {debt_to_equity:.2f}</td>
                 </tr>
                 <tr>
                     <td>Market Position</td>
-                    <td>{1 if market_cap > 100000000000 else 0.5 if market_cap > 10000000000 else 0}/1</td>
-                    <td>${market_cap/1000000000:.1f}B market cap</td>
+                    <td>{size_score}/1</td>
+                    <td>${market_cap_billions_str}B market cap</td>
                 </tr>
             </table>
             
             <p><strong>Overall Assessment:</strong></p>
             <p>Based on fundamental analysis, {symbol} receives a <strong>{rating}</strong> rating with a composite score of {rating_score:.1f}/6.0. 
-            This rating reflects {"strong fundamentals and growth prospects" if rating == "BUY" else "stable business with moderate prospects" if rating == "HOLD" else "challenges requiring careful consideration"}.</p>
+            This rating reflects {rating_summary}.</p>
             
             <p><strong>Key Rating Drivers:</strong></p>
             <ul>
-                <li>{"Strong" if revenue_growth > 10 else "Moderate" if revenue_growth > 0 else "Weak"} revenue growth trajectory</li>
-                <li>{"Excellent" if profit_margins > 15 else "Good" if profit_margins > 10 else "Adequate" if profit_margins > 5 else "Concerning"} profitability metrics</li>
-                <li>{"Strong" if debt_to_equity < 0.3 else "Moderate" if debt_to_equity < 0.6 else "High"} financial leverage</li>
-                <li>{"Large-cap" if market_cap > 100000000000 else "Mid-cap" if market_cap > 10000000000 else "Small-cap"} market positioning</li>
+                <li>{growth_driver} revenue growth trajectory</li>
+                <li>{margin_driver} profitability metrics</li>
+                <li>{leverage_driver} financial leverage</li>
+                <li>{size_driver} market positioning</li>
             </ul>
         </div>
         """
     
-    def generate_comprehensive_report(self, symbol: str) -> str:
+    # Bucket cutoffs, ascending. For "higher is more" measures the bucket is the
+    # number of cutoffs a value exceeds (bisect_left); for beta's stability note
+    # and leverage it is the number of cutoffs reached (bisect_right).
+    _CAP_CUTOFFS = (10000000000, 50000000000, 100000000000, 200000000000)
+    _MARGIN_CUTOFFS = (5, 10, 15, 20)
+    _GROWTH_CUTOFFS = (0, 5, 10, 15)
+    _PE_CUTOFFS = (10, 15, 25)
+    _BETA_CUTOFFS = (0.8, 1.2)
+    _BETA_STABILITY_CUTOFFS = (1.0, 1.3)
+    _PRICE_CHANGE_CUTOFFS = (-10, 10)
+    _LEVERAGE_CUTOFFS = (0.3, 0.6)
+    _NPM_CUTOFFS = (0.03, 0.08, 0.15)
+    _ATO_CUTOFFS = (0.8, 1.5)
+    _EM_CUTOFFS = (1.5, 3)
+    
+    # Assessment phrases indexed by bucket
+    _SIZE_ASSESSMENT = ("Mid-cap participant", "Mid-cap participant", "Mid-to-large cap player",
+                        "Mid-to-large cap player", "Large-cap leader")
+    _SCALE_ADVANTAGE = ("Growing market presence", "Established market position", "Established market position",
+                        "Significant market presence", "Significant market presence")
+    _SIZE_CLASS = ("mid-cap company", "mid-to-large cap company", "mid-to-large cap company",
+                   "mid-to-large cap company", "large-cap multinational corporation")
+    _CAP_STRENGTH = ("stable", "stable", "strong", "strong", "strong")
+    _CAP_OUTLOOK = ("focus on core business optimization", "focus on core business optimization",
+                    "focus on core business optimization", "continued investment in innovation and market expansion",
+                    "continued investment in innovation and market expansion")
+    _MARKET_POSITION = ("Growing market position", "Strong market presence", "Strong market presence",
+                        "Market leadership", "Market leadership")
+    _VALUATION_STRENGTH = ("solid", "solid", "strong", "strong", "strong")
+    
+    _MARGIN_ASSESSMENT = ("Moderate profitability", "Moderate profitability", "Strong margins",
+                          "Strong margins", "Superior profitability")
+    _EFFICIENCY_NOTE = ("show room for improvement", "indicate solid management execution",
+                        "indicate solid management execution", "demonstrate strong operational control",
+                        "demonstrate strong operational control")
+    _PROFIT_ASSESSMENT = ("Margin pressure", "Moderately profitable", "Moderately profitable",
+                          "Highly profitable", "Highly profitable")
+    _MARGIN_STRENGTH = ("adequate", "adequate", "adequate", "robust", "robust")
+    _MARGIN_MEANING = ("reasonable operational efficiency", "reasonable operational efficiency",
+                       "efficient cost management and pricing power", "efficient cost management and pricing power",
+                       "efficient cost management and pricing power")
+    _MARGIN_FOCUS = ("Margin improvement initiatives", "Adequate cost control", "Adequate cost control",
+                     "Strong margin management", "Strong margin management")
+    
+    _GROWTH_ASSESSMENT = ("Revenue challenges", "Moderate growth", "Moderate growth",
+                          "Strong growth trajectory", "Strong growth trajectory")
+    _REVENUE_FOCUS = ("Revenue optimization efforts", "Moderate growth focus", "Moderate growth focus",
+                      "Successful growth strategy", "Successful growth strategy")
+    
+    _PE_ASSESSMENT = ("Value pricing", "Value pricing", "Market valuation", "Premium valuation")
+    _VALUATION_NOTE = ("Value-oriented pricing", "Balanced valuation metrics", "Balanced valuation metrics",
+                       "Premium market positioning")
+    _BETA_ASSESSMENT = ("Lower volatility than market", "Market-aligned volatility", "Higher volatility than market")
+    _STABILITY_NOTE = ("Lower market sensitivity", "Market-correlated performance", "Higher growth/risk profile")
+    _GROWTH_FOCUS = ("restructuring and recovery", "operational efficiency and market consolidation",
+                     "growth and expansion")
+    
+    _NPM_ASSESSMENT = ("Low", "Moderate", "Good", "Excellent")
+    _ATO_ASSESSMENT = ("Low", "Moderate", "High")
+    _EM_ASSESSMENT = ("Conservative", "Moderate", "High")
+    
+    # (rating score, rating driver) per bucket, shared by the score table and the driver list
+    _GROWTH_RATING = ((0, "Weak"), (0.5, "Moderate"), (1, "Moderate"), (2, "Strong"), (2, "Strong"))
+    _MARGIN_RATING = ((0, "Concerning"), (1, "Adequate"), (1.5, "Good"), (2, "Excellent"), (2, "Excellent"))
+    _LEVERAGE_RATING = ((1, "Strong"), (0.5, "Moderate"), (0, "High"))
+    _SIZE_RATING = ((0, "Small-cap"), (0.5, "Mid-cap"), (0.5, "Mid-cap"), (1, "Large-cap"), (1, "Large-cap"))
+    
+    # The same four factors as rows (growth, margin, leverage, size) for scoring many
+    # companies at once. Leverage's two cutoffs are padded with inf and its score row
+    # with its last score, so every row has four cutoffs and five buckets.
+    _RATING_THRESHOLDS = np.array([_GROWTH_CUTOFFS, _MARGIN_CUTOFFS, _LEVERAGE_CUTOFFS + (np.inf, np.inf),
+                                   _CAP_CUTOFFS], dtype=np.float64)
+    _RATING_REACHED = np.array([False, False, True, False])  # rows bucketed with bisect_right
+    _RATING_SCORES = np.array([
+        tuple(score for score, _ in _GROWTH_RATING),
+        tuple(score for score, _ in _MARGIN_RATING),
+        tuple(score for score, _ in _LEVERAGE_RATING) + (_LEVERAGE_RATING[-1][0],) * 2,
+        tuple(score for score, _ in _SIZE_RATING),
+    ], dtype=np.float64)
+    
+    def __init__(self):
+        # symbol -> (info dict the metrics came from, metrics)
+        self._metrics_cache: Dict[str, tuple] = {}
+        # (symbol, inline_css, day) -> report HTML; report HTML -> PDF bytes
+        self._html_cache: Dict[tuple, str] = {}
+        self._pdf_cache: Dict[str, bytes] = {}
+    
+    def clear_cache(self) -> None:
+        """Drop memoized reports, metrics and same-day downloads so the next request renders afresh"""
+        self._metrics_cache.clear()
+        self._html_cache.clear()
+        self._pdf_cache.clear()
+        with _memory_lock:
+            _ticker_cache.clear()
+            _bundle_cache.clear()
+        # Statements only move each reporting period, so keep those on disk
+        _disk_cache.discard(['info', 'close_prices'])
+    
+    def fetch_company_data(self, symbol: str) -> Dict[str, Any]:
+        """Fetch comprehensive company data from multiple sources"""
+        try:
+            # Failed downloads raise, so the bundle cache never stores them
+            bundle = _get_bundle(symbol.upper())
+            
+            return {**bundle, 'symbol': symbol.upper()}
+        except Exception as e:
+            print(f"Error fetching data for {symbol}: {e}")
+            return {'symbol': symbol.upper(), 'error': str(e)}
+    
+    def calculate_financial_metrics(self, data: Dict) -> Dict[str, Any]:
+        """Calculate comprehensive financial metrics and ratios"""
+        if 'error' in data:
+            return {}
+        
+        symbol = data.get('symbol')
+        info = data.get('info', {})
+        
+        # Cached bundles hand back the same info dict until they are refetched,
+        # so identity tells whether a stored result is still current
+        cached = self._metrics_cache.get(symbol)
+        if cached is not None and cached[0] is info:
+            return dict(cached[1])
+        
+        metrics = self._compute_financial_metrics(data, info)
+        if metrics:
+            _remember(self._metrics_cache, symbol, (info, metrics), self.METRICS_CACHE_SIZE)
+        return dict(metrics)
+    
+    def _compute_financial_metrics(self, data: Dict, info: Dict) -> Dict[str, Any]:
+        """Derive the metrics dict from a company data bundle"""
+        try:
+            # Basic metrics from info; `or 0` covers both None and missing values
+            metrics = {out: info.get(src) or 0 for out, src in _METRIC_MAP}
+            for out, fallback in _METRIC_FALLBACKS:
+                if not metrics[out]:
+                    metrics[out] = info.get(fallback) or 0
+            
+            # Get current price from history if not in info
+            if metrics['current_price'] == 0:
+                closes = data.get('close_prices')
+                if closes is not None and closes.size:
+                    metrics['current_price'] = float(closes[-1])
+            
+            # Calculate additional metrics with safety checks
+            if metrics['pe_ratio'] > 0 and metrics['earnings_growth'] > 0:
+                metrics['peg_calculated'] = metrics['pe_ratio'] / (metrics['earnings_growth'] * 100)
+            
+            # DuPont Analysis: decompose ROE from the statements when revenue,
+            # assets and equity are all known; otherwise fall back to reported ROE
+            profit_margin = metrics['profit_margin']
+            total_assets = metrics['total_assets']
+            total_equity = metrics['total_equity']
+            revenue = metrics['total_revenue']
+            has_balance = profit_margin > 0 and total_assets > 0 and total_equity > 0
+            has_statements = has_balance and revenue > 0
+            
+            if has_statements or metrics['roe'] > 0:
+                asset_turnover = revenue / total_assets if has_statements else 1.0
+                equity_multiplier = total_assets / total_equity if has_balance else 1.0
+                metrics['dupont'] = {
+                    'net_profit_margin': profit_margin,
+                    'asset_turnover': asset_turnover,
+                    'equity_multiplier': equity_multiplier,
+                    'roe_calculated': (profit_margin * asset_turnover * equity_multiplier
+                                       if has_statements else metrics['roe'])
+                }
+            
+            return metrics
+            
+        except Exception as e:
+            print(f"Error calculating financial metrics: {e}")
+            return {}
+    
+    def generate_header_section(self, ctx: ReportContext) -> str:
+        """Generate report header with company information"""
+        return self._TPL_HEADER.format_map({
+            'company_name': ctx.company_name,
+            'symbol': ctx.symbol,
+            'sector': ctx.sector or 'N/A',
+            'industry': ctx.industry or 'N/A',
+            'target_price': ctx.current_price * 1.15,  # 15% upside assumption
+        })
+    
+    def generate_business_overview(self, ctx: ReportContext) -> str:
+        """Generate business overview section"""
+        return self._TPL_BUSINESS_OVERVIEW.format_map({
+            'description': ctx.description,
+            'website': ctx.website or '',
+            'employees': ctx.employees or 0,
+        })
+    
+    def generate_financial_snapshot(self, ctx: ReportContext, metrics: Dict) -> str:
+        """Generate 4-year financial snapshot with projections"""
+        try:
+            rows = ctx.financial_rows
+            years = ctx.financial_years[:4]
+            
+            if not rows or not years:
+                # Use available info data to create a basic financial snapshot
+                revenue = metrics.get('total_revenue', 0)
+                market_cap = metrics.get('market_cap', 0)
+                
+                if revenue > 0 or market_cap > 0:
+                    financial_table = f"""
+                    <div class="section-title">3. Financial Snapshot</div>
+                    <table class="financial-table">
+                        <tr><th>Metric</th><th>Current</th></tr>
+                        <tr><td><strong>Market Cap</strong></td><td>${market_cap/1e9:.2f}B</td></tr>
+                        <tr><td><strong>Total Revenue (TTM)</strong></td><td>${revenue/1e9:.2f}B</td></tr>
+                        <tr><td><strong>Net Profit Margin</strong></td><td>{(metrics.get('profit_margin', 0) * 100):.2f}%</td></tr>
+                        <tr><td><strong>Gross Margin</strong></td><td>{(metrics.get('gross_margins', 0) * 100):.2f}%</td></tr>
+                        <tr><td><strong>Operating Margin</strong></td><td>{(metrics.get('operating_margins', 0) * 100):.2f}%</td></tr>
+                    </table>
+                    """
+                else:
+                    financial_table = """
+                    <div class="section-title">3. Financial Snapshot</div>
+                    <p>Detailed historical financial data is not available. Current market metrics are shown in other sections.</p>
+                    """
+            else:
+                # Try to find revenue data with multiple possible names
+                revenue_row = _keyword_row(rows, _REVENUE_KEYWORDS)
+                
+                # Try to find net income data
+                net_income_row = _keyword_row(rows, _INCOME_KEYWORDS)
+                
+                # Collect fragments and join once instead of re-copying a growing string
+                parts = ["""
+                <div class="section-title">3. Financial Snapshot (Last 4 Years + Projections)</div>
+                <table class="financial-table">
+                    <tr><th>Metric</th>
+                """]
+                
+                for year in years:
+                    parts.append(f"<th>{year.strftime('%Y')}</th>")
+                
+                parts.append("<th>Projected</th></tr>")
+                
+                # Add revenue row if available
+                if revenue_row is not None:
+                    parts.append("<tr><td><strong>Revenue ($ Billions)</strong></td>")
+                    revenue_values = _row_billions(revenue_row, len(years))
+                    for value in revenue_values:
+                        parts.append(f"<td>${value:,.1f}B</td>")
+                    
+                    # Simple projection
+                    if len(revenue_values) >= 2 and revenue_values[1] != 0:
+                        growth_rate = (revenue_values[0] - revenue_values[1]) / revenue_values[1]
+                        projected = revenue_values[0] * (1 + max(growth_rate, -0.2))  # Cap negative growth
+                        parts.append(f"<td>${projected:,.1f}B</td>")
+                    else:
+                        parts.append("<td>N/A</td>")
+                    parts.append("</tr>")
+                
+                # Add net income row if available
+                if net_income_row is not None:
+                    parts.append("<tr><td><strong>Net Income ($ Billions)</strong></td>")
+                    for value in _row_billions(net_income_row, len(years)):
+                        parts.append(f"<td>${value:,.1f}B</td>")
+                    parts.append("<td>N/A</td></tr>")
+                
+                # Add current metrics
+                parts.append(f"""
+                    <tr><td><strong>Net Profit Margin</strong></td>
+                        <td colspan="5">{(metrics.get('profit_margin', 0) * 100):.2f}%</td></tr>
+                    <tr><td><strong>Gross Margin</strong></td>
+                        <td colspan="5">{(metrics.get('gross_margins', 0) * 100):.2f}%</td></tr>
+                """)
+                
+                parts.append("</table>")
+                financial_table = "".join(parts)
+            
+            # Shareholding pattern
+            held_institutions = metrics.get('held_percent_institutions', 0) * 100
+            held_insiders = metrics.get('held_percent_insiders', 0) * 100
+            public_holding = max(0, 100 - held_institutions - held_insiders)
+            
+            shareholding_section = f"""
+            <h4>Shareholding Pattern</h4>
+            <div class="metric-grid">
+                <div class="metric-box">
+                    <div class="metric-label">Institutional Holdings</div>
+                    <div class="metric-value">{held_institutions:.1f}%</div>
+                </div>
+                <div class="metric-box">
+                    <div class="metric-label">Insider Holdings</div>
+                    <div class="metric-value">{held_insiders:.1f}%</div>
+                </div>
+            </div>
+            <div class="metric-grid">
+                <div class="metric-box">
+                    <div class="metric-label">Public Holdings</div>
+                    <div class="metric-value">{public_holding:.1f}%</div>
+                </div>
+                <div class="metric-box">
+                    <div class="metric-label">Shares Outstanding</div>
+                    <div class="metric-value">{metrics.get('shares_outstanding', 0)/1e6:.0f}M</div>
+                </div>
+            </div>
+            """
+            
+            return financial_table + shareholding_section
+            
+        except Exception as e:
+            print(f"Error generating financial snapshot: {e}")
+            return f"""
+            <div class="section-title">3. Financial Snapshot</div>
+            <p>Error processing financial data: {str(e)}</p>
+            <p>Current market cap: ${metrics.get('market_cap', 0)/1e9:.2f}B</p>
+            <p>Current price: ${metrics.get('current_price', 0):.2f}</p>
+            """
+    
+    def generate_key_metrics(self, metrics: Dict) -> str:
+        """Generate key financial metrics section"""
+        return self._TPL_KEY_METRICS.format_map({
+            key: metrics.get(key, 0) * 100
+            for key in ('roe', 'roce', 'gross_margins', 'operating_margins', 'ebitda_margins', 'dividend_yield')
+        })
+    
+    def generate_ratios_table(self, metrics: Dict) -> str:
+        """Generate comprehensive financial ratios table"""
+        # Missing and zero values become NaN and render as N/A
+        values = np.array([metrics.get(key) or np.nan for key in self._RATIO_FIELDS], dtype=np.float64)
+        text = np.char.add(np.char.mod('%.2f', values * self._RATIO_SCALE), self._RATIO_SUFFIX)
+        text = np.where(np.isnan(values), 'N/A', text)
+        
+        return self._TPL_RATIOS.format_map(dict(zip(self._RATIO_FIELDS, text.tolist())))
+    
+    def generate_dupont_analysis(self, metrics: Dict) -> str:
+        """Generate DuPont analysis section"""
+        dupont = metrics.get('dupont', {})
+        
+        if not dupont and metrics.get('roe', 0) > 0:
+            # Create a simplified DuPont analysis if we have ROE
+            dupont = {
+                'net_profit_margin': metrics.get('profit_margin', 0),
+                'asset_turnover': 1.0,  # Placeholder
+                'equity_multiplier': 1.0 + (metrics.get('debt_to_equity', 0) / 100),  # Approximation
+                'roe_calculated': metrics.get('roe', 0)
+            }
+        
+        if not dupont:
+            return self._DUPONT_UNAVAILABLE
+        
+        def safe_format(value, is_percentage=False):
+            if value is None or value == 0:
+                return "N/A"
+            try:
+                if is_percentage:
+                    return f"{float(value * 100):.2f}%"
+                else:
+                    return f"{float(value):.3f}"
+            except (ValueError, TypeError):
+                return "N/A"
+        
+        npm = dupont.get('net_profit_margin', 0)
+        ato = dupont.get('asset_turnover', 0) 
+        em = dupont.get('equity_multiplier', 0)
+        roe_calc = dupont.get('roe_calculated', 0)
+        
+        # Each component appears three times in the section; format it once
+        npm_s = safe_format(npm, True)
+        ato_s = safe_format(ato)
+        em_s = safe_format(em)
+        
+        return self._TPL_DUPONT.format_map({
+            'npm_s': npm_s,
+            'ato_s': ato_s,
+            'em_s': em_s,
+            'roe_calculated': safe_format(roe_calc, True),
+            'roe_reported': safe_format(metrics.get('roe'), True),
+            'debt_to_equity': safe_format(metrics.get('debt_to_equity')),
+            'npm_assessment': self._NPM_ASSESSMENT[bisect_left(self._NPM_CUTOFFS, npm)],
+            'ato_assessment': self._ATO_ASSESSMENT[bisect_left(self._ATO_CUTOFFS, ato)],
+            'em_assessment': self._EM_ASSESSMENT[bisect_left(self._EM_CUTOFFS, em)],
+        })
+    
+    def generate_industry_overview(self, ctx: ReportContext) -> str:
+        """Generate industry overview section with real data analysis"""
+        sector = ctx.sector or 'N/A'
+        industry = ctx.industry or 'N/A'
+        
+        # Get key financial metrics for competitive analysis
+        market_cap = ctx.market_cap
+        beta = ctx.beta
+        pe_ratio = ctx.pe_ratio
+        profit_margins = ctx.profit_margins
+        
+        cap = bisect_left(self._CAP_CUTOFFS, market_cap)
+        margin = bisect_left(self._MARGIN_CUTOFFS, profit_margins)
+        pe = bisect_left(self._PE_CUTOFFS, pe_ratio)
+        
+        return self._TPL_INDUSTRY.format_map({
+            'sector': sector,
+            'industry': industry,
+            'symbol': ctx.symbol,
+            'sector_lower': sector.lower(),
+            'industry_lower': industry.lower(),
+            'market_cap_str': ctx.market_cap_str,
+            'market_cap_billions_str': ctx.market_cap_billions_str,
+            'beta': beta,
+            'pe_ratio': pe_ratio,
+            'profit_margins_str': ctx.profit_margins_str,
+            # Determine competitive position based on metrics
+            'competitive_position': "strong" if cap > 2 and margin > 2 else "moderate" if cap > 0 else "developing",
+            'size_assessment': self._SIZE_ASSESSMENT[cap],
+            'beta_assessment': self._BETA_ASSESSMENT[bisect_left(self._BETA_CUTOFFS, beta)],
+            'pe_assessment': self._PE_ASSESSMENT[pe],
+            'margin_assessment': self._MARGIN_ASSESSMENT[margin],
+            'scale_advantage': self._SCALE_ADVANTAGE[cap],
+            'efficiency_note': self._EFFICIENCY_NOTE[margin],
+            'stability_note': self._STABILITY_NOTE[bisect_right(self._BETA_STABILITY_CUTOFFS, beta)],
+            'valuation_note': self._VALUATION_NOTE[pe],
+        })
+    
+    def generate_disclaimer(self) -> str:
+        """Generate comprehensive disclaimer"""
+        return self._TPL_DISCLAIMER.format_map({'date': datetime.now().strftime('%B %d, %Y')})
+    
+    def generate_strategic_highlights(self, ctx: ReportContext) -> str:
+        """Generate strategic highlights based on actual company data"""
+        business_summary = ctx.business_summary
+        market_cap = ctx.market_cap
+        cap = bisect_left(self._CAP_CUTOFFS, market_cap)
+        
+        # Get recent performance metrics
+        current_price, _, price_52w_ago = _recent_prices(ctx.close_prices)
+        price_change_52w = 0
+        if price_52w_ago is not None:
+            price_change_52w = ((current_price - price_52w_ago) / price_52w_ago) * 100
+        
+        return self._TPL_STRATEGIC.format_map({
+            'business_summary': business_summary[:500] + ("..." if len(business_summary) > 500 else ""),
+            'symbol': ctx.symbol,
+            'size_class': self._SIZE_CLASS[cap],
+            'market_cap_str': ctx.market_cap_str,
+            'employee_count': f"{ctx.employees:,}" if ctx.employees is not None else 'N/A',
+            'price_direction': "gained" if price_change_52w > 0 else "declined",
+            'price_change_abs': abs(price_change_52w),
+            'sector': ctx.sector or 'Multiple sectors',
+            'industry': ctx.industry or 'diversified operations',
+            'growth_focus': self._GROWTH_FOCUS[bisect_left(self._PRICE_CHANGE_CUTOFFS, price_change_52w)],
+            'cap_strength': self._CAP_STRENGTH[cap],
+            'cap_outlook': self._CAP_OUTLOOK[cap],
+        })
+    
+    def generate_quarterly_performance(self, ctx: ReportContext) -> str:
+        """Generate quarterly performance analysis from available data"""
+        # Get recent financial metrics
+        revenue_growth = ctx.revenue_growth
+        profit_margins = ctx.profit_margins
+        
+        # Calculate recent price performance
+        growth = bisect_left(self._GROWTH_CUTOFFS, revenue_growth)
+        margin = bisect_left(self._MARGIN_CUTOFFS, profit_margins)
+        
+        current_price, q_ago_price, _ = _recent_prices(ctx.close_prices)
+        quarterly_performance = None
+        if q_ago_price is not None:
+            # Last 3 months performance
+            quarterly_performance = ((current_price - q_ago_price) / q_ago_price) * 100
+        
+        if quarterly_performance is None:
+            stock_performance = "Data not available for quarterly comparison"
+            market_performance = "N/A"
+            market_assessment = "Market aligned performance"
+        else:
+            stock_performance = market_performance = f"Q4 2024: {quarterly_performance:+.1f}%"
+            # Judge the rounded figure that is shown
+            market_assessment = "Outperforming market" if round(quarterly_performance, 1) > 5 else "Market aligned performance"
+        
+        return self._TPL_QUARTERLY.format_map({
+            'symbol': ctx.symbol,
+            'revenue': ctx.total_revenue,
+            'revenue_growth_str': ctx.revenue_growth_str,
+            'profit_margins_str': ctx.profit_margins_str,
+            'stock_performance': stock_performance,
+            'market_performance': market_performance,
+            'market_assessment': market_assessment,
+            'growth_assessment': self._GROWTH_ASSESSMENT[growth],
+            'profit_assessment': self._PROFIT_ASSESSMENT[margin],
+            'trend_summary': "strong operational performance" if growth > 1 and margin > 1 else "stable business fundamentals" if growth > 0 else "operational challenges requiring attention",
+            'margin_strength': self._MARGIN_STRENGTH[margin],
+            'margin_meaning': self._MARGIN_MEANING[margin],
+        })
+    
+    def generate_brand_portfolio(self, ctx: ReportContext) -> str:
+        """Generate brand portfolio and geographic analysis"""
+        # Extract available geographic and business data
+        country = ctx.country or 'United States'
+        sector = ctx.sector or 'Technology'
+        industry = ctx.industry or 'Software'
+        domestic = country == "United States"
+        
+        return self._TPL_BRAND_PORTFOLIO.format_map({
+            'symbol': ctx.symbol,
+            'country': country,
+            'sector': sector,
+            'industry': industry,
+            'website': ctx.website or 'N/A',
+            'sector_lower': sector.lower(),
+            'industry_lower': industry.lower(),
+            'reach': "globally" if domestic else "regionally",
+            'expansion': "international expansion opportunities" if domestic else "strong domestic market position",
+            'revenue_mix': "diverse revenue streams across multiple geographies" if domestic else "concentrated market exposure",
+            'brand_strategy': "innovation and technology leadership" if sector == "Technology" else "operational excellence and customer service" if sector == "Consumer Cyclical" else "strategic market positioning",
+        })
+    
+    def generate_management_commentary(self, ctx: ReportContext) -> str:
+        """Generate management commentary section"""
+        market_cap = ctx.market_cap
+        revenue_growth = ctx.revenue_growth
+        profit_margins = ctx.profit_margins
+        
+        cap = bisect_left(self._CAP_CUTOFFS, market_cap)
+        growth = bisect_left(self._GROWTH_CUTOFFS, revenue_growth)
+        margin = bisect_left(self._MARGIN_CUTOFFS, profit_margins)
+        
+        return self._TPL_MANAGEMENT.format_map({
+            'revenue_growth_str': ctx.revenue_growth_str,
+            'profit_margins_str': ctx.profit_margins_str,
+            'market_cap_billions_str': ctx.market_cap_billions_str,
+            # Zero growth still counts as stable here, so this one checks the value itself
+            'execution': "strong strategic execution" if growth > 1 else "stable operational management" if revenue_growth >= 0 else "challenging period requiring strategic adjustments",
+            'revenue_focus': self._REVENUE_FOCUS[growth],
+            'margin_focus': self._MARGIN_FOCUS[margin],
+            'market_position': self._MARKET_POSITION[cap],
+            'outlook': "aggressive expansion and innovation" if growth > 3 and margin > 2 else "balanced growth and profitability" if growth > 1 and margin > 1 else "operational optimization and efficiency improvements",
+            'valuation_strength': self._VALUATION_STRENGTH[cap],
+            'risk_approach': "conservative and well-balanced" if profit_margins > 10 else "moderately aggressive" if revenue_growth > profit_margins else "focused on growth over short-term profitability",
+        })
+    
+    def generate_ratings_rationale(self, ctx: ReportContext) -> str:
+        """Generate ratings rationale section"""
+        # Calculate key rating factors
+        market_cap = ctx.market_cap
+        revenue_growth = ctx.revenue_growth
+        profit_margins = ctx.profit_margins
+        debt_to_equity = ctx.debt_to_equity
+        
+        # Bucket each factor once; its score feeds both the table and the total
+        growth_score, growth_driver = self._GROWTH_RATING[bisect_left(self._GROWTH_CUTOFFS, revenue_growth)]
+        margin_score, margin_driver = self._MARGIN_RATING[bisect_left(self._MARGIN_CUTOFFS, profit_margins)]
+        leverage_score, leverage_driver = self._LEVERAGE_RATING[bisect_right(self._LEVERAGE_CUTOFFS, debt_to_equity)]
+        size_score, size_driver = self._SIZE_RATING[bisect_left(self._CAP_CUTOFFS, market_cap)]
+        
+        # Calculate composite rating
+        rating_score = growth_score + margin_score + leverage_score + size_score
+        
+        # Determine rating
+        if rating_score >= 5: rating = "BUY"
+        elif rating_score >= 3.5: rating = "HOLD"
+        else: rating = "SELL"
+        
+        return self._TPL_RATINGS.format_map({
+            'symbol': ctx.symbol,
+            'rating': rating,
+            'rating_score': rating_score,
+            'revenue_growth_str': ctx.revenue_growth_str,
+            'profit_margins_str': ctx.profit_margins_str,
+            'debt_to_equity': debt_to_equity,
+            'market_cap_billions_str': ctx.market_cap_billions_str,
+            'growth_score': growth_score,
+            'margin_score': margin_score,
+            'leverage_score': leverage_score,
+            'size_score': size_score,
+            'rating_summary': "strong fundamentals and growth prospects" if rating == "BUY" else "stable business with moderate prospects" if rating == "HOLD" else "challenges requiring careful consideration",
+            'growth_driver': growth_driver,
+            'margin_driver': margin_driver,
+            'leverage_driver': leverage_driver,
+            'size_driver': size_driver,
+        })
+    
+    @classmethod
+    def rating_scores(cls, contexts: List[ReportContext]) -> np.ndarray:
+        """Composite rating score per context, matching generate_ratings_rationale, bucketed in one pass"""
+        values = np.array([(ctx.revenue_growth, ctx.profit_margins, ctx.debt_to_equity, ctx.market_cap)
+                           for ctx in contexts], dtype=np.float64).reshape(-1, 4, 1)
+        # Cutoffs exceeded (bisect_left) or, for leverage, reached (bisect_right);
+        # "not below" keeps bisect_right's handling of NaN
+        buckets = np.where(cls._RATING_REACHED[:, None], ~(values < cls._RATING_THRESHOLDS),
+                           values > cls._RATING_THRESHOLDS).sum(axis=2)
+        return cls._RATING_SCORES[np.arange(4), buckets].sum(axis=1)
+    
+    def generate_comprehensive_report(self, symbol: str, inline_css: bool = True) -> str:
         """Generate complete comprehensive educational equity research report"""
+        # inline_css=False suits HTML that only feeds generate_pdf_bytes, which
+        # applies the precompiled stylesheet itself
+        
+        # The underlying data is refreshed daily, so a report is reused for the day
+        cache_key = (symbol.upper(), inline_css, date.today())
+        cached = self._html_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         # Fetch data
         data = self.fetch_company_data(symbol)
         
@@ -1023,50 +1530,74 @@ class ComprehensiveReportGenerator:
         
         # Calculate metrics
         metrics = self.calculate_financial_metrics(data)
+        ctx = ReportContext.from_data(data)
         
-        # Generate all sections
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>Educational Equity Research Report - {symbol}</title>
-            <style>{self.css_styles}</style>
-        </head>
-        <body>
-            {self.generate_header_section(data)}
-            {self.generate_business_overview(data)}
-            {self.generate_financial_snapshot(data, metrics)}
-            {self.generate_key_metrics(metrics)}
-            {self.generate_strategic_highlights(data)}
-            {self.generate_quarterly_performance(data)}
-            {self.generate_industry_overview(data)}
-            {self.generate_brand_portfolio(data)}
-            {self.generate_management_commentary(data)}
-            {self.generate_ratios_table(metrics)}
-            {self.generate_dupont_analysis(metrics)}
-            {self.generate_ratings_rationale(data)}
-            
-            {self.generate_disclaimer()}
-        </body>
-        </html>
-        """
+        # Generate all sections in report order; the empty entry keeps a
+        # spacer line before the disclaimer
+        sections = [
+            self.generate_header_section(ctx),
+            self.generate_business_overview(ctx),
+            self.generate_financial_snapshot(ctx, metrics),
+            self.generate_key_metrics(metrics),
+            self.generate_strategic_highlights(ctx),
+            self.generate_quarterly_performance(ctx),
+            self.generate_industry_overview(ctx),
+            self.generate_brand_portfolio(ctx),
+            self.generate_management_commentary(ctx),
+            self.generate_ratios_table(metrics),
+            self.generate_dupont_analysis(metrics),
+            self.generate_ratings_rationale(ctx),
+            "",
+            self.generate_disclaimer(),
+        ]
         
+        html_content = "".join((
+            self._TPL_PAGE_HEAD.format_map({
+                'symbol': symbol,
+                'style': f"<style>{self.css_styles}</style>" if inline_css else "",
+            }),
+            "\n            ".join(sections),
+            self._PAGE_FOOT,
+        ))
+        
+        _remember(self._html_cache, cache_key, html_content, self.REPORT_CACHE_SIZE)
         return html_content
     
+    def build_report(self, symbol: str, inline_css: bool = True) -> Report:
+        """Generate the report for symbol; WeasyPrint only runs if its .pdf is read"""
+        html_content = self.generate_comprehensive_report(symbol, inline_css=inline_css)
+        return Report(symbol=symbol.upper(), html=html_content, generator=self)
+    
+    def generate_reports(self, symbols: List[str], inline_css: bool = True) -> Dict[str, str]:
+        """Generate reports for several symbols concurrently, keyed by symbol"""
+        if not symbols:
+            return {}
+        # Report time is dominated by the Yahoo downloads, which release the GIL
+        # while they wait, so threads overlap them without pickling to subprocesses
+        with ThreadPoolExecutor(max_workers=min(8, len(symbols))) as pool:
+            reports = pool.map(lambda symbol: self.generate_comprehensive_report(symbol, inline_css), symbols)
+            return dict(zip(symbols, reports))
+    
     def generate_pdf_bytes(self, html_content: str) -> Optional[bytes]:
         """Convert HTML to PDF bytes"""
-        if not WEASYPRINT_AVAILABLE:
+        cached = self._pdf_cache.get(html_content)
+        if cached is not None:
+            return cached
+        
+        weasyprint = _weasyprint()
+        if weasyprint is None:
             # Return HTML as text if WeasyPrint not available
-            return html_content.encode('utf-8')
+            return _with_inline_css(html_content).encode('utf-8')
         
         try:
+            HTML, compiled_css, font_config = weasyprint
             html_doc = HTML(string=html_content)
-            pdf_bytes = html_doc.write_pdf()
+            pdf_bytes = html_doc.write_pdf(stylesheets=[compiled_css], font_config=font_config)
+            _remember(self._pdf_cache, html_content, pdf_bytes, self.REPORT_CACHE_SIZE)
             return pdf_bytes
         except Exception as e:
             print(f"Error generating PDF: {e}")
-            return html_content.encode('utf-8')
+            return _with_inline_css(html_content).encode('utf-8')
 
 # Global instance for use in other modules
 comprehensive_generator = ComprehensiveReportGenerator()
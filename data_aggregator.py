@@ -4,23 +4,130 @@ Handles multiple data sources: yfinance, Alpha Vantage, NewsAPI, Reddit
 """
 
 import yfinance as yf
-import requests
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
 import os
+import json
 from typing import Dict, List, Optional, Tuple
 import time
 import asyncio
+import threading
+from functools import lru_cache
 import aiohttp
+from cachetools import TTLCache
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from transformers import pipeline
 from dotenv import load_dotenv
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 
+def _json_loads(raw: bytes):
+    """Parse a JSON document with orjson when installed, stdlib json otherwise"""
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+# SEC's ticker -> CIK table (~1 MB of JSON) changes rarely, so it is kept on disk for a day
+_CIK_MAP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'sec', 'cik_map.json')
+_CIK_MAP_TTL = 24 * 60 * 60
+
+def _read_cik_map() -> Optional[Tuple[Dict[str, str], float]]:
+    """Saved ticker -> CIK map and its save time, or None when missing, unreadable or older than a day"""
+    try:
+        saved_at = os.path.getmtime(_CIK_MAP_PATH)
+        if time.time() - saved_at > _CIK_MAP_TTL:
+            return None
+        with open(_CIK_MAP_PATH, 'rb') as f:
+            return _json_loads(f.read()), saved_at
+    except (OSError, ValueError):
+        return None
+
+def _write_cik_map(cik_map: Dict[str, str]) -> None:
+    """Write atomically so concurrent readers never see a partial file"""
+    tmp_path = f"{_CIK_MAP_PATH}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(_CIK_MAP_PATH), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(cik_map) if ORJSON_AVAILABLE else json.dumps(cik_map).encode())
+        os.replace(tmp_path, _CIK_MAP_PATH)
+    except OSError as e:
+        print(f"Could not cache SEC CIK map: {e}")
+
+# Any sequence-classification model with positive/negative/neutral labels works; a
+# distilled 6-layer model such as
+# mrm8488/distilroberta-finetuned-financial-news-sentiment-analysis runs about twice
+# as fast as the 12-layer FinBERT at some cost in accuracy
+_FINBERT_MODEL = os.getenv('FINBERT_MODEL', 'ProsusAI/finbert')
+_FINBERT_LABELS = ('positive', 'negative', 'neutral')
+_FINBERT_INT8_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'finbert-int8',
+                                 _FINBERT_MODEL.replace('/', '--'))
+
+def _build_finbert_int8():
+    """FinBERT exported to ONNX with int8 weights, run on ONNX Runtime; built once and kept on disk"""
+    # Raises ImportError when optimum[onnxruntime] is not installed
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+    
+    # The quantized model file is written last, so its presence means the export finished
+    if not os.path.exists(os.path.join(_FINBERT_INT8_DIR, "model_quantized.onnx")):
+        AutoTokenizer.from_pretrained(_FINBERT_MODEL).save_pretrained(_FINBERT_INT8_DIR)
+        model = ORTModelForSequenceClassification.from_pretrained(_FINBERT_MODEL, export=True)
+        qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=True)
+        ORTQuantizer.from_pretrained(model).quantize(save_dir=_FINBERT_INT8_DIR, quantization_config=qconfig)
+    
+    model = ORTModelForSequenceClassification.from_pretrained(_FINBERT_INT8_DIR, file_name="model_quantized.onnx")
+    tokenizer = AutoTokenizer.from_pretrained(_FINBERT_INT8_DIR)
+    return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer, top_k=1)
+
+# One FinBERT and one VADER analyzer per process, shared by every aggregator, so
+# several aggregators (or server workers' threads) don't each hold a copy
+_FINBERT_LOCK = threading.Lock()
+
+@lru_cache(maxsize=None)
+def _build_finbert():
+    """FinBERT sentiment pipeline, int8 ONNX Runtime when optimum is installed; None if unavailable"""
+    try:
+        return _build_finbert_int8()
+    except ImportError:
+        pass
+    except Exception as e:
+        print(f"Could not build int8 FinBERT, falling back to PyTorch: {e}")
+    
+    try:
+        return pipeline("sentiment-analysis", 
+                        model=_FINBERT_MODEL,
+                        top_k=1)
+    except:
+        return None
+
+@lru_cache(maxsize=None)
+def _vader() -> SentimentIntensityAnalyzer:
+    """VADER analyzer, parsing its lexicon on the first call only"""
+    return SentimentIntensityAnalyzer()
+
+# How long each source's results are reused: prices and fundamentals move
+# intraday, news over hours, and the SEC filing list at most daily
+_RESULT_TTLS = {
+    'financial_data': 15 * 60,
+    'sentiment_data': 4 * 60 * 60,
+    'sec_data': 24 * 60 * 60,
+}
+
+# Free-tier Alpha Vantage requests per day
+_ALPHA_VANTAGE_DAILY_LIMIT = 25
+
+# Marks a lazily built attribute that has not been built yet (None means it failed)
+_UNLOADED = object()
+
 class AdvancedDataAggregator:
     def __init__(self):
         self.alpha_vantage_key = os.getenv('ALPHA_VANTAGE_API_KEY')
@@ -29,22 +136,84 @@ class AdvancedDataAggregator:
         self.reddit_client_secret = os.getenv('REDDIT_CLIENT_SECRET')
         
         # Sentiment analyzers
-        self.vader_analyzer = SentimentIntensityAnalyzer()
+        self.vader_analyzer = _vader()
         
-        # Initialize FinBERT for financial sentiment (will download on first use)
-        try:
-            self.finbert_analyzer = pipeline("sentiment-analysis", 
-                                            model="ProsusAI/finbert",
-                                            return_all_scores=True)
-        except:
-            self.finbert_analyzer = None
+        # FinBERT for financial sentiment is loaded on first use (see finbert_analyzer),
+        # so callers that never score news skip the model download and its memory
+        self._finbert_analyzer = _UNLOADED
         
         # Rate limiting trackers
         self.last_alpha_vantage_call = 0
+        self._last_alpha_vantage_request = 0
         self.last_newsapi_call = 0
         self.alpha_vantage_calls_today = 0
         self.newsapi_calls_today = 0
         self.call_date = datetime.now().date()
+        
+        # One HTTP session (and its connection pool) for every request; created on
+        # first use because it belongs to the event loop that is running then
+        self._session = None
+        self._session_loop = None
+        self._alpha_vantage_lock = None
+        self._cik_lock = None
+        
+        # Recent results per source, so repeated tickers skip the network
+        self._result_caches = {source: TTLCache(maxsize=256, ttl=ttl) for source, ttl in _RESULT_TTLS.items()}
+        
+        # Ticker -> zero-padded CIK, loaded on the first SEC lookup
+        self._cik_map = None
+        self._cik_map_loaded = 0
+    
+    async def __aenter__(self):
+        await self._http()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def _http(self) -> aiohttp.ClientSession:
+        """Shared HTTP session, reopened if closed or created under another event loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            if self._session is not None and not self._session.closed:
+                try:
+                    await self._session.close()
+                except RuntimeError:
+                    # Its event loop is already closed; detaching still marks the
+                    # session closed and lets its connector be collected
+                    self._session.detach()
+            # Keep-alive connections are pooled per host; DNS answers are reused for
+            # five minutes instead of aiohttp's default ten seconds
+            connector = aiohttp.TCPConnector(limit=50, limit_per_host=20, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=10))
+            self._session_loop = loop
+            # Serializes Alpha Vantage calls across concurrent tasks so its pacing holds
+            self._alpha_vantage_lock = asyncio.Lock()
+            self._cik_lock = asyncio.Lock()
+        return self._session
+    
+    async def _get_json(self, url: str, headers: Optional[Dict] = None) -> Optional[Dict]:
+        """Decoded JSON body of a GET, or None for a non-200 response"""
+        session = await self._http()
+        async with session.get(url, headers=headers) as response:
+            if response.status != 200:
+                return None
+            return _json_loads(await response.read())
+    
+    async def aclose(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    @property
+    def finbert_analyzer(self):
+        """FinBERT pipeline, built on first access; None when it cannot be loaded"""
+        if self._finbert_analyzer is _UNLOADED:
+            with _FINBERT_LOCK:
+                if self._finbert_analyzer is _UNLOADED:
+                    self._finbert_analyzer = _build_finbert()
+        return self._finbert_analyzer
     
     def check_rate_limits(self):
         """Reset daily counters if new day"""
@@ -66,78 +235,93 @@ class AdvancedDataAggregator:
             'error_log': []
         }
         
+        # Alpha Vantage data (if API key available and under limits), started first so
+        # its 12 s pacing runs while the yfinance downloads are in flight
+        alpha_vantage = None
+        if (self.alpha_vantage_key and 
+            self.alpha_vantage_calls_today < _ALPHA_VANTAGE_DAILY_LIMIT and 
+            time.time() - self.last_alpha_vantage_call > 12):  # 5 calls per minute max
+            alpha_vantage = asyncio.ensure_future(self._fetch_alpha_vantage(ticker, data))
+        
         # Yahoo Finance data (primary source)
         try:
             stock = yf.Ticker(ticker)
-            info = stock.info
-            
-            # Get historical data
-            hist_1y = stock.history(period="1y")
-            hist_5y = stock.history(period="5y")
             
-            # Get financial statements
-            financials = stock.financials
-            balance_sheet = stock.balance_sheet
-            cashflow = stock.cashflow
-            
-            data['yfinance_data'] = {
-                'info': info,
-                'historical_1y': hist_1y,
-                'historical_5y': hist_5y,
-                'financials': financials,
-                'balance_sheet': balance_sheet,
-                'cashflow': cashflow,
-                'recommendations': stock.recommendations,
-                'calendar': stock.calendar,
-                'institutional_holders': stock.institutional_holders,
-                'major_holders': stock.major_holders
+            # Each yfinance attribute is a separate blocking download; run them on
+            # worker threads so they overlap each other and leave the event loop free
+            loaders = {
+                'info': lambda: stock.info,
+                'historical_1y': lambda: stock.history(period="1y"),
+                'historical_5y': lambda: stock.history(period="5y"),
+                'financials': lambda: stock.financials,
+                'balance_sheet': lambda: stock.balance_sheet,
+                'cashflow': lambda: stock.cashflow,
+                'recommendations': lambda: stock.recommendations,
+                'calendar': lambda: stock.calendar,
+                'institutional_holders': lambda: stock.institutional_holders,
+                'major_holders': lambda: stock.major_holders
             }
+            loop = asyncio.get_running_loop()
+            results = await asyncio.gather(*(loop.run_in_executor(None, loader) for loader in loaders.values()))
+            
+            data['yfinance_data'] = dict(zip(loaders, results))
             
         except Exception as e:
             data['error_log'].append(f"YFinance error: {str(e)}")
         
-        # Alpha Vantage data (if API key available and under limits)
-        if (self.alpha_vantage_key and 
-            self.alpha_vantage_calls_today < 25 and 
-            time.time() - self.last_alpha_vantage_call > 12):  # 5 calls per minute max
-            
-            try:
-                # Get overview data
-                overview_url = f"https://www.alphavantage.co/query?function=OVERVIEW&symbol={ticker}&apikey={self.alpha_vantage_key}"
-                response = requests.get(overview_url, timeout=10)
-                
-                if response.status_code == 200:
-                    overview_data = response.json()
-                    if 'Symbol' in overview_data:
-                        data['alpha_vantage_data']['overview'] = overview_data
-                        self.alpha_vantage_calls_today += 1
-                        self.last_alpha_vantage_call = time.time()
-                
-                # Get technical indicators if we have calls left
-                if self.alpha_vantage_calls_today < 24:
-                    time.sleep(12)  # Rate limit compliance
-                    
-                    # RSI
-                    rsi_url = f"https://www.alphavantage.co/query?function=RSI&symbol={ticker}&interval=daily&time_period=14&series_type=close&apikey={self.alpha_vantage_key}"
-                    rsi_response = requests.get(rsi_url, timeout=10)
-                    
-                    if rsi_response.status_code == 200:
-                        rsi_data = rsi_response.json()
-                        if 'Technical Analysis: RSI' in rsi_data:
-                            data['technical_indicators']['rsi'] = rsi_data['Technical Analysis: RSI']
-                            self.alpha_vantage_calls_today += 1
-                
-            except Exception as e:
-                data['error_log'].append(f"Alpha Vantage error: {str(e)}")
-        
         # Calculate enhanced financial ratios
         try:
             data['financial_ratios'] = self.calculate_enhanced_ratios(data['yfinance_data'])
         except Exception as e:
             data['error_log'].append(f"Financial ratios calculation error: {str(e)}")
         
+        if alpha_vantage is not None:
+            await alpha_vantage
+        
         return data
     
+    async def _alpha_vantage_get(self, url: str) -> Optional[Dict]:
+        """GET from Alpha Vantage no sooner than 12 s after the previous request (5 calls per minute); None once the daily quota is spent"""
+        # Callers hold the Alpha Vantage lock, so the quota is checked and counted
+        # per request sent; the caller's gate ran before queueing and may be stale
+        self.check_rate_limits()
+        if self.alpha_vantage_calls_today >= _ALPHA_VANTAGE_DAILY_LIMIT:
+            return None
+        # The sleep yields so other fetches carry on
+        await asyncio.sleep(max(0, 12 - (time.time() - self._last_alpha_vantage_request)))
+        self._last_alpha_vantage_request = time.time()
+        self.alpha_vantage_calls_today += 1
+        return await self._get_json(url)
+    
+    async def _fetch_alpha_vantage(self, ticker: str, data: Dict) -> None:
+        """Add Alpha Vantage overview and RSI for ticker to data, pacing calls 12 s apart"""
+        try:
+            await self._http()
+            async with self._alpha_vantage_lock:
+                # Get overview data
+                overview_url = f"https://www.alphavantage.co/query?function=OVERVIEW&symbol={ticker}&apikey={self.alpha_vantage_key}"
+                overview_data = await self._alpha_vantage_get(overview_url)
+                
+                if overview_data is not None and 'Symbol' in overview_data:
+                    data['alpha_vantage_data']['overview'] = overview_data
+                    self.last_alpha_vantage_call = time.time()
+                
+                # Get technical indicators; skipped by _alpha_vantage_get when no calls are left
+                rsi_url = f"https://www.alphavantage.co/query?function=RSI&symbol={ticker}&interval=daily&time_period=14&series_type=close&apikey={self.alpha_vantage_key}"
+                rsi_data = await self._alpha_vantage_get(rsi_url)
+                
+                if rsi_data is not None and 'Technical Analysis: RSI' in rsi_data:
+                    # {date: {'RSI': '64.3700'}} per day, newest first; keep it as two
+                    # aligned arrays instead of hundreds of one-key dicts
+                    rsi_series = rsi_data['Technical Analysis: RSI']
+                    data['technical_indicators']['rsi_dates'] = np.array(list(rsi_series), dtype='datetime64[D]')
+                    data['technical_indicators']['rsi'] = np.fromiter(
+                        (float(point['RSI']) for point in rsi_series.values()),
+                        dtype=np.float32, count=len(rsi_series))
+            
+        except Exception as e:
+            data['error_log'].append(f"Alpha Vantage error: {str(e)}")
+    
     def calculate_enhanced_ratios(self, yf_data: Dict) -> Dict:
         """Calculate comprehensive financial ratios"""
         info = yf_data.get('info', {})
@@ -182,11 +366,12 @@ class AdvancedDataAggregator:
             
             # Calculate ratios from financial statements if available
             if not financials.empty and len(financials.columns) > 0:
-                latest_year = financials.columns[0]
+                # Take the latest year's column once instead of a .loc lookup per cell
+                latest = financials.iloc[:, 0]
                 
                 # Interest coverage ratio
-                operating_income = financials.loc['Operating Income', latest_year] if 'Operating Income' in financials.index else None
-                interest_expense = financials.loc['Interest Expense', latest_year] if 'Interest Expense' in financials.index else None
+                operating_income = latest.get('Operating Income')
+                interest_expense = latest.get('Interest Expense')
                 
                 if operating_income and interest_expense and interest_expense != 0:
                     ratios['leverage']['interest_coverage'] = abs(operating_income / interest_expense)
@@ -194,12 +379,14 @@ class AdvancedDataAggregator:
             # Growth ratios (calculate from historical data)
             if not financials.empty and len(financials.columns) >= 2:
                 try:
-                    current_revenue = financials.loc['Total Revenue', financials.columns[0]]
-                    previous_revenue = financials.loc['Total Revenue', financials.columns[1]]
+                    # Newest year first, as a plain float array for the arithmetic below
+                    revenue = financials.loc['Total Revenue'].to_numpy(dtype=np.float64)
+                    current_revenue = revenue[0]
+                    previous_revenue = revenue[1]
                     
                     ratios['growth'] = {
                         'revenue_growth_yoy': ((current_revenue - previous_revenue) / previous_revenue) if previous_revenue != 0 else None,
-                        'revenue_growth_cagr': self.calculate_cagr(financials.loc['Total Revenue']) if len(financials.columns) >= 3 else None
+                        'revenue_growth_cagr': self.calculate_cagr(revenue) if len(financials.columns) >= 3 else None
                     }
                 except:
                     ratios['growth'] = {'revenue_growth_yoy': None, 'revenue_growth_cagr': None}
@@ -209,13 +396,14 @@ class AdvancedDataAggregator:
         
         return ratios
     
-    def calculate_cagr(self, series: pd.Series) -> Optional[float]:
-        """Calculate Compound Annual Growth Rate"""
+    def calculate_cagr(self, series) -> Optional[float]:
+        """Calculate Compound Annual Growth Rate from values ordered newest first (Series or array)"""
         try:
-            values = series.dropna()
+            values = np.asarray(series, dtype=np.float64)
+            values = values[~np.isnan(values)]
             if len(values) >= 2:
-                start_value = values.iloc[-1]  # Oldest value
-                end_value = values.iloc[0]     # Most recent value
+                start_value = values[-1]  # Oldest value
+                end_value = values[0]     # Most recent value
                 periods = len(values) - 1
                 
                 if start_value > 0:
@@ -247,10 +435,9 @@ class AdvancedDataAggregator:
                 
                 url = f"https://newsapi.org/v2/everything?q={company_name}&from={from_date}&sortBy=relevancy&language=en&apikey={self.newsapi_key}"
                 
-                response = requests.get(url, timeout=10)
+                news_data = await self._get_json(url)
                 
-                if response.status_code == 200:
-                    news_data = response.json()
+                if news_data is not None:
                     articles = news_data.get('articles', [])[:20]  # Limit to 20 articles
                     
                     for article in articles:
@@ -269,10 +456,13 @@ class AdvancedDataAggregator:
             except Exception as e:
                 sentiment_data['error_log'].append(f"NewsAPI error: {str(e)}")
         
-        # Analyze sentiment of collected articles
+        # Analyze sentiment of collected articles; model loading and inference are
+        # CPU-bound, so they run on the same worker pool as the yfinance downloads
         if sentiment_data['news_articles']:
             try:
-                sentiment_data['sentiment_summary'] = self.analyze_sentiment(sentiment_data['news_articles'])
+                loop = asyncio.get_running_loop()
+                sentiment_data['sentiment_summary'] = await loop.run_in_executor(
+                    None, self.analyze_sentiment, sentiment_data['news_articles'])
             except Exception as e:
                 sentiment_data['error_log'].append(f"Sentiment analysis error: {str(e)}")
         
@@ -282,6 +472,7 @@ class AdvancedDataAggregator:
         """Analyze sentiment using VADER and FinBERT"""
         vader_scores = []
         finbert_scores = []
+        texts = []
         
         for article in articles:
             text = f"{article.get('title', '')} {article.get('description', '')}"
@@ -290,14 +481,20 @@ class AdvancedDataAggregator:
                 # VADER sentiment
                 vader_score = self.vader_analyzer.polarity_scores(text)
                 vader_scores.append(vader_score)
-                
-                # FinBERT sentiment (if available)
-                if self.finbert_analyzer:
-                    try:
-                        finbert_result = self.finbert_analyzer(text[:512])  # Limit text length
-                        finbert_scores.append(finbert_result[0])
-                    except:
-                        pass
+                # Per-article score for the sentiment timeline chart
+                article['compound'] = vader_score['compound']
+                texts.append(text[:512])  # Limit text length
+        
+        # FinBERT sentiment (if available), all articles in one batched call so the
+        # model pads once and runs full batches instead of one forward pass per article
+        if self.finbert_analyzer and texts:
+            try:
+                # 256 tokens covers the 512-character texts; attention cost grows with the square of length
+                results = self.finbert_analyzer(texts, batch_size=16, truncation=True, max_length=256)
+                # Only the top label is requested; keep the per-article list shape either way
+                finbert_scores = [result if isinstance(result, list) else [result] for result in results]
+            except:
+                finbert_scores = []
         
         # Calculate summary statistics
         summary = {
@@ -313,9 +510,11 @@ class AdvancedDataAggregator:
         if not scores:
             return {}
         
-        compound_scores = [score['compound'] for score in scores]
+        compound_scores = np.fromiter((score['compound'] for score in scores), dtype=np.float64, count=len(scores))
         
-        avg_compound = sum(compound_scores) / len(compound_scores)
+        avg_compound = float(compound_scores.mean())
+        positive_articles = int(np.count_nonzero(compound_scores >= 0.05))
+        negative_articles = int(np.count_nonzero(compound_scores <= -0.05))
         
         # Classify overall sentiment
         if avg_compound >= 0.05:
@@ -328,9 +527,9 @@ class AdvancedDataAggregator:
         return {
             'average_compound_score': avg_compound,
             'overall_sentiment': overall_sentiment,
-            'positive_articles': len([s for s in compound_scores if s >= 0.05]),
-            'negative_articles': len([s for s in compound_scores if s <= -0.05]),
-            'neutral_articles': len([s for s in compound_scores if -0.05 < s < 0.05])
+            'positive_articles': positive_articles,
+            'negative_articles': negative_articles,
+            'neutral_articles': len(compound_scores) - positive_articles - negative_articles
         }
     
     def summarize_finbert_scores(self, scores: List[List[Dict]]) -> Dict:
@@ -338,15 +537,14 @@ class AdvancedDataAggregator:
         if not scores:
             return {}
         
-        # Extract dominant sentiments
-        sentiments = []
-        for score_list in scores:
-            max_score = max(score_list, key=lambda x: x['score'])
-            sentiments.append(max_score['label'])
+        # Stack scores and labels as (articles x classes); the pipeline may order classes
+        # differently per article, so each row's argmax is mapped through its own labels
+        score_matrix = np.array([[item['score'] for item in score_list] for score_list in scores])
+        label_matrix = np.array([[item['label'] for item in score_list] for score_list in scores])
+        sentiments = label_matrix[np.arange(len(scores)), score_matrix.argmax(axis=1)]
         
-        positive_count = sentiments.count('positive')
-        negative_count = sentiments.count('negative')
-        neutral_count = sentiments.count('neutral')
+        counts = [int(np.count_nonzero(sentiments == label)) for label in _FINBERT_LABELS]
+        positive_count, negative_count, neutral_count = counts
         
         total = len(sentiments)
         
@@ -354,71 +552,96 @@ class AdvancedDataAggregator:
             'positive_percentage': (positive_count / total) * 100 if total > 0 else 0,
             'negative_percentage': (negative_count / total) * 100 if total > 0 else 0,
             'neutral_percentage': (neutral_count / total) * 100 if total > 0 else 0,
-            'dominant_sentiment': max(['positive', 'negative', 'neutral'], 
-                                    key=lambda x: sentiments.count(x))
+            'dominant_sentiment': _FINBERT_LABELS[counts.index(max(counts))]
         }
     
+    async def _cik_for(self, ticker: str, headers: Dict) -> Optional[str]:
+        """SEC CIK for ticker from the cached map, downloading the map once a day"""
+        if self._cik_map is None or time.time() - self._cik_map_loaded > _CIK_MAP_TTL:
+            await self._http()
+            # Concurrent lookups wait for one download instead of each fetching the map
+            async with self._cik_lock:
+                if self._cik_map is None or time.time() - self._cik_map_loaded > _CIK_MAP_TTL:
+                    saved = _read_cik_map()
+                    if saved is not None:
+                        # Age the in-memory copy from the file's save time, not from this read
+                        cik_map, loaded_at = saved
+                    else:
+                        companies = await self._get_json("https://www.sec.gov/files/company_tickers.json", headers=headers)
+                        if companies is None:
+                            return None
+                        cik_map = {}
+                        for company_data in companies.values():
+                            # The first listing of a ticker wins, as with the old linear scan
+                            cik_map.setdefault(company_data.get('ticker', '').upper(), str(company_data['cik_str']).zfill(10))
+                        _write_cik_map(cik_map)
+                        loaded_at = time.time()
+                    self._cik_map = cik_map
+                    self._cik_map_loaded = loaded_at
+        return self._cik_map.get(ticker.split('.')[0].upper())
+    
     async def get_sec_filings_summary(self, ticker: str) -> Dict:
         """Get recent SEC filings summary (free API)"""
         try:
             # Use SEC's EDGAR API (free)
             headers = {'User-Agent': 'equity-research-app contact@example.com'}
             
-            # Search for company CIK
-            search_url = f"https://www.sec.gov/files/company_tickers.json"
-            response = requests.get(search_url, headers=headers, timeout=10)
+            # Look up the company's CIK
+            cik = await self._cik_for(ticker, headers)
             
-            if response.status_code == 200:
-                companies = response.json()
-                
-                # Find company by ticker
-                cik = None
-                for company_data in companies.values():
-                    if company_data.get('ticker', '').upper() == ticker.split('.')[0].upper():
-                        cik = str(company_data['cik_str']).zfill(10)
-                        break
+            if cik:
+                # Get recent filings
+                filings_url = f"https://data.sec.gov/submissions/CIK{cik}.json"
+                filings_data = await self._get_json(filings_url, headers=headers)
                 
-                if cik:
-                    # Get recent filings
-                    filings_url = f"https://data.sec.gov/submissions/CIK{cik}.json"
-                    filings_response = requests.get(filings_url, headers=headers, timeout=10)
+                if filings_data is not None:
+                    recent_filings = filings_data.get('filings', {}).get('recent', {})
                     
-                    if filings_response.status_code == 200:
-                        filings_data = filings_response.json()
-                        recent_filings = filings_data.get('filings', {}).get('recent', {})
-                        
-                        # Extract last 5 filings
-                        forms = recent_filings.get('form', [])[:5]
-                        filing_dates = recent_filings.get('filingDate', [])[:5]
-                        accession_numbers = recent_filings.get('accessionNumber', [])[:5]
-                        
-                        filings_summary = []
-                        for i in range(min(len(forms), 5)):
-                            filings_summary.append({
-                                'form': forms[i],
-                                'filing_date': filing_dates[i],
-                                'accession_number': accession_numbers[i]
-                            })
-                        
-                        return {
-                            'company_name': filings_data.get('name', ''),
-                            'cik': cik,
-                            'recent_filings': filings_summary
-                        }
+                    # Extract last 5 filings
+                    forms = recent_filings.get('form', [])[:5]
+                    filing_dates = recent_filings.get('filingDate', [])[:5]
+                    accession_numbers = recent_filings.get('accessionNumber', [])[:5]
+                    
+                    filings_summary = []
+                    for i in range(min(len(forms), 5)):
+                        filings_summary.append({
+                            'form': forms[i],
+                            'filing_date': filing_dates[i],
+                            'accession_number': accession_numbers[i]
+                        })
+                    
+                    return {
+                        'company_name': filings_data.get('name', ''),
+                        'cik': cik,
+                        'recent_filings': filings_summary
+                    }
             
             return {'error': 'Company not found in SEC database'}
             
         except Exception as e:
             return {'error': f'SEC filings error: {str(e)}'}
     
+    async def _cached(self, source: str, key, fetch) -> Dict:
+        """Recent result for key from source's cache, else await fetch() and keep it if it succeeded"""
+        cache = self._result_caches[source]
+        result = cache.get(key)
+        if result is None:
+            result = await fetch()
+            # Failures are retried on the next call rather than served for the whole TTL
+            if not result.get('error') and not result.get('error_log'):
+                cache[key] = result
+        # Copy the top level so callers can't replace the cached entries
+        return dict(result)
+    
     async def get_comprehensive_data(self, ticker: str, company_name: str) -> Dict:
         """Get all data from multiple sources"""
         
         # Start all data collection tasks
+        key = ticker.upper()
         tasks = [
-            self.get_enhanced_financial_data(ticker),
-            self.get_news_sentiment(company_name, ticker),
-            self.get_sec_filings_summary(ticker)
+            self._cached('financial_data', key, lambda: self.get_enhanced_financial_data(ticker)),
+            self._cached('sentiment_data', (key, company_name), lambda: self.get_news_sentiment(company_name, ticker)),
+            self._cached('sec_data', key, lambda: self.get_sec_filings_summary(ticker))
         ]
         
         try:
@@ -433,3 +656,18 @@ class AdvancedDataAggregator:
         
         except Exception as e:
             return {'error': f'Data collection failed: {str(e)}'}
+    
+    async def get_many(self, pairs: List[Tuple[str, str]], max_concurrency: int = 10) -> Dict[str, Dict]:
+        """get_comprehensive_data for several (ticker, company_name) pairs, keyed by ticker"""
+        if not pairs:
+            return {}
+        # Bounds how many tickers are in flight at once; Alpha Vantage calls are
+        # additionally serialized by their lock, so its pacing holds across tickers
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def collect(ticker: str, company_name: str) -> Dict:
+            async with semaphore:
+                return await self.get_comprehensive_data(ticker, company_name)
+        
+        results = await asyncio.gather(*(collect(ticker, company_name) for ticker, company_name in pairs))
+        return {ticker: result for (ticker, _), result in zip(pairs, results)}
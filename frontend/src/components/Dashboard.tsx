@@ -152,7 +152,13 @@ export default function Dashboard({ ticker, analysisLevel }: DashboardProps) {
           if (response.ok) {
             const data = await response.json();
             console.log('Chart data fetched successfully');
-            setChartData(data.chartData || []);
+            // Columnar payload; rebuild the per-point records the chart expects
+            const dates: string[] = data.dates || [];
+            setChartData(dates.map((date, i) => ({
+              date,
+              price: data.prices[i],
+              volume: data.volumes[i],
+            })));
             return; // Success, exit the retry loop
           } else {
             throw new Error(`HTTP ${response.status}: ${response.statusText}`);
@@ -0,0 +1,19 @@
+"""
+Gunicorn configuration for the bridge server.
+Run with: gunicorn -c gunicorn_conf.py bridge_server:app
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('BACKEND_PORT', '5001')}"
+
+# Threaded workers: yfinance does its HTTP through libcurl (curl_cffi), which
+# gevent cannot make cooperative but which releases the GIL, so real threads
+# keep a worker serving other requests and the bridge's own thread pools
+# still fetch in parallel
+workers = int(os.getenv('BRIDGE_WORKERS', '4'))
+worker_class = 'gthread'
+threads = int(os.getenv('BRIDGE_THREADS', '8'))
+
+# PDF generation can take a while for large reports
+timeout = 120
@@ -25,7 +25,7 @@ fi
 cleanup() {
     echo -e "\n🛑 Shutting down servers..."
     # Kill backend server
-    pkill -f bridge_server.py 2>/dev/null || true
+    pkill -f bridge_server 2>/dev/null || true
     # Kill frontend server
     pkill -f "next dev" 2>/dev/null || true
     echo "✅ Cleanup complete"
@@ -48,7 +48,7 @@ npm install --silent
 cd ..
 
 echo "🔧 Starting backend server..."
-.venv/bin/python bridge_server.py &
+.venv/bin/gunicorn -c gunicorn_conf.py bridge_server:app &
 BACKEND_PID=$!
 
 # Wait for backend to start